@@ -2,3 +2,5 @@ from .action import Action
 from .action import PlayerAction
 from .action import InterfaceAction
 from .action import ItemAction
+from .action import diff_actions
+from .action import merge_actions
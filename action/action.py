@@ -1,19 +1,42 @@
 class Action(object):
-    """Defines an action."""
+    """Defines an action.
 
-    def __init__(self, game, function, description, *args, **kwargs):
+    Actions are identified by their key, the ids of the origin and target and the verb, so an action
+    rebuilt for the same objects is equal to the previous one even when its description changed."""
+
+    def __init__(self, game, function, description, verb='use', *args, **kwargs):
         self.game = game
         self.function = function
         self.description = description
+        self.verb = verb
+        self.origin = None
+        self.target = None
 
     def __str__(self):
         return self.description
 
+    @property
+    def key(self):
+        """The (origin id, verb, target id) identity of the action."""
+
+        origin_id = self.origin.id if self.origin is not None else None
+        target_id = self.target.id if self.target is not None else None
+
+        return origin_id, self.verb, target_id
+
     def __eq__(self, other):
         if not isinstance(other, Action):
             return NotImplemented
 
-        return self.description == other.description
+        return self.key == other.key
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+
+        return result if result is NotImplemented else not result
+
+    def __hash__(self):
+        return hash(self.key)
 
     def do(self):
         self.game.player.last_action = self
@@ -45,3 +68,46 @@ class ItemAction(Action):
         super(ItemAction, self).__init__(*args, **kwargs)
         self.origin = item
         self.target = device
+
+
+def diff_actions(old_actions, new_actions):
+    """Return the new actions added, the old actions removed, and the (old, new) action pairs kept.
+
+    Actions pair up when they have the same verb and the same origin and target objects."""
+
+    old_by_objects = {(action.origin, action.verb, action.target): action for action in old_actions}
+    added = []
+    kept = []
+
+    for action in new_actions:
+        old_action = old_by_objects.pop((action.origin, action.verb, action.target), None)
+        if old_action is None:
+            added.append(action)
+        else:
+            kept.append((old_action, action))
+
+    removed = list(old_by_objects.values())
+
+    return added, removed, kept
+
+
+def merge_actions(actions, new_actions):
+    """Return the new numbered actions, reusing each current action paired with a new one.
+
+    Reused actions take the new description, which can follow the state of their objects."""
+
+    # cached actions come back as the same objects when nothing changed
+    if len(actions) == len(new_actions) and all(actions.get(number) is action
+                                                for number, action in new_actions.items()):
+        return new_actions
+
+    added, removed, kept = diff_actions(actions.values(), new_actions.values())
+
+    reused = {}
+
+    for old_action, action in kept:
+        if old_action.description != action.description:
+            old_action.description = action.description
+        reused[id(action)] = old_action
+
+    return {number: reused.get(id(action), action) for number, action in new_actions.items()}
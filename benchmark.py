@@ -0,0 +1,209 @@
+import math
+import argparse
+from timeit import default_timer
+from game import Game
+from game.gameui import MainUI
+from level import Level
+from level.generator import LevelGenerator
+from level.generator import register_level_config
+
+parser = argparse.ArgumentParser()
+parser.add_argument('-s', '--sizes', required=False, type=int, nargs='+', default=[8, 16, 32, 64, 128],
+                    help='map edge lengths to benchmark')
+parser.add_argument('-r', '--repeat', required=False, type=int, default=5, help='timed runs per measurement')
+parser.add_argument('--seed', required=False, type=int, default=0, help='seed for generated levels')
+parser.add_argument('--density', required=False, type=float, default=0.4, help='fraction of cells on the path')
+parser.add_argument('--sparse', required=False, action='store_true', help='materialize only occupied map cells')
+parser.add_argument('-d', '--deaths', required=False, type=int, nargs='+', default=[100, 250, 500, 1000],
+                    help='death scenario counts to benchmark')
+parser.add_argument('--death-size', required=False, type=int, default=32, help='map edge length of the death levels')
+
+# generated levels are registered after the hand-written ones
+FIRST_GENERATED_LEVEL = 1000
+FIRST_DEATH_LEVEL = 2000
+
+
+def time_call(function, repeat):
+    """Return the best wall time in milliseconds of repeat calls to function."""
+
+    best = None
+
+    for i in range(repeat):
+        start = default_timer()
+        function()
+        elapsed = (default_timer() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+
+    return best
+
+
+def get_exponent(sizes, times, i):
+    """Return the empirical growth exponent of times against sizes between measurements i - 1 and i."""
+
+    if i == 0 or times[i - 1] <= 0 or times[i] <= 0:
+        return None
+
+    return math.log(times[i] / times[i - 1]) / math.log(sizes[i] / sizes[i - 1])
+
+
+def get_build_function(game, number):
+    """Return a function that builds the level from its config, without the level template."""
+
+    def build():
+        Level(game, number).build()
+
+    return build
+
+
+def get_move_function(game):
+    """Return a function that moves the player off the enter cell and back."""
+
+    player = game.player
+    enter_x, enter_y = player.location
+    moves = [(enter_x + dx, enter_y + dy) for dx, dy in ((0, -1), (1, 0), (0, 1), (-1, 0))]
+    moves = [move for move in moves if game.level.map.is_passable(*move)]
+
+    def move():
+        if moves:
+            player.move_to(*moves[0])
+        player.move_to(enter_x, enter_y)
+
+    return move
+
+
+def benchmark_scaling(sizes, repeat, seed, density, sparse=False):
+    """Time level build, setup from the level template, player moves, and rendering on generated levels of increasing size."""
+
+    game = None
+    rows = []
+
+    for number, size in enumerate(sizes, start=FIRST_GENERATED_LEVEL):
+        cell_count = size * size
+        generator = LevelGenerator(
+            seed=seed,
+            x_dim=size,
+            y_dim=size,
+            path_density=density,
+            device_count=max(1, cell_count // 16),
+            interface_count=max(1, cell_count // 32),
+            item_count=max(1, cell_count // 16),
+            death_count=max(1, cell_count // 64),
+            property_count=max(1, cell_count // 128),
+            sparse=sparse)
+        register_level_config(number, generator.make_config())
+
+        if game is None:
+            game = Game(debug=True, level=number)
+        # setup clones the level template, compiled on first use
+        setup_ms = time_call(lambda: game.setup(number), repeat)
+        build_ms = time_call(get_build_function(game, number), repeat)
+
+        move_ms = time_call(get_move_function(game), repeat)
+        ui = MainUI(game)
+        render_ms = time_call(ui.get_ui, repeat)
+
+        rows.append((size, cell_count, len(game.level.map.path.cells), build_ms, setup_ms, move_ms, render_ms))
+
+    return rows
+
+
+def get_death_check_function(game):
+    """Return a function that checks the level for a death the way the main loop does."""
+
+    level = game.level
+
+    def check():
+        if level.kills_player():
+            level.get_death()
+
+    return check
+
+
+def benchmark_deaths(death_counts, repeat, seed, size, density, sparse=False):
+    """Time level build, setup from the level template, and the per-turn death check on levels with increasing deaths."""
+
+    game = None
+    rows = []
+
+    for number, death_count in enumerate(death_counts, start=FIRST_DEATH_LEVEL):
+        cell_count = size * size
+        generator = LevelGenerator(
+            seed=seed,
+            x_dim=size,
+            y_dim=size,
+            path_density=density,
+            device_count=max(1, cell_count // 16),
+            interface_count=max(1, cell_count // 32),
+            item_count=max(1, cell_count // 16),
+            death_count=death_count,
+            property_count=max(1, cell_count // 128),
+            sparse=sparse)
+        register_level_config(number, generator.make_config())
+
+        if game is None:
+            game = Game(debug=True, level=number)
+        # setup clones the level template, compiled on first use
+        setup_ms = time_call(lambda: game.setup(number), repeat)
+        build_ms = time_call(get_build_function(game, number), repeat)
+
+        check_ms = time_call(get_death_check_function(game), repeat)
+        move_ms = time_call(get_move_function(game), repeat)
+
+        rows.append((death_count, len(game.level.deaths), build_ms, setup_ms, check_ms, move_ms))
+
+    return rows
+
+
+def report_deaths(rows):
+    """Print the death check timings with the growth exponent of each measurement against death count."""
+
+    death_counts = [row[0] for row in rows]
+    columns = [[row[i] for row in rows] for i in (2, 3, 4, 5)]
+
+    print('{0:>8} {1:>16} {2:>16} {3:>16} {4:>16}'.format(
+        'deaths', 'build ms (k)', 'setup ms (k)', 'check ms (k)', 'move ms (k)'))
+
+    for i, row in enumerate(rows):
+        timings = []
+        for times in columns:
+            exponent = get_exponent(death_counts, times, i)
+            exponent_text = '{0:.2f}'.format(exponent) if exponent is not None else '-'
+            timings.append('{0:.3f} ({1})'.format(times[i], exponent_text))
+        print('{0:>8} {1:>16} {2:>16} {3:>16} {4:>16}'.format(row[1], *timings))
+
+    print('\nk is the growth exponent against death count since the previous count (1.00 = linear).')
+
+
+def report_scaling(rows):
+    """Print the scaling curve with the growth exponent of each measurement against cell count."""
+
+    cell_counts = [row[1] for row in rows]
+    columns = [[row[i] for row in rows] for i in (3, 4, 5, 6)]
+
+    print('{0:>6} {1:>8} {2:>8} {3:>16} {4:>16} {5:>16} {6:>16}'.format(
+        'size', 'cells', 'path', 'build ms (k)', 'setup ms (k)', 'move ms (k)', 'render ms (k)'))
+
+    for i, row in enumerate(rows):
+        timings = []
+        for times in columns:
+            exponent = get_exponent(cell_counts, times, i)
+            exponent_text = '{0:.2f}'.format(exponent) if exponent is not None else '-'
+            timings.append('{0:.3f} ({1})'.format(times[i], exponent_text))
+        print('{0:>6} {1:>8} {2:>8} {3:>16} {4:>16} {5:>16} {6:>16}'.format(row[0], row[1], row[2], *timings))
+
+    print('\nk is the growth exponent against cell count since the previous size (1.00 = linear).')
+
+
+def main():
+
+    args = parser.parse_args()
+    rows = benchmark_scaling(args.sizes, args.repeat, args.seed, args.density, args.sparse)
+    report_scaling(rows)
+
+    print('')
+    rows = benchmark_deaths(args.deaths, args.repeat, args.seed, args.death_size, args.density, args.sparse)
+    report_deaths(rows)
+
+
+if __name__ == "__main__":
+    main()
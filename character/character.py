@@ -1,8 +1,18 @@
 import error
+import event
 import utility
+from uuid import uuid4
 from action import PlayerAction
 from action import ItemAction
+from action import merge_actions
 from inventory import Inventory
+from level.map import EMPTY_CELL
+
+# visibility modes: adjacent d4 cells, all objects within a radius, or objects within a radius and line of sight
+VISIBILITY_D4 = 'd4'
+VISIBILITY_RADIUS = 'radius'
+VISIBILITY_SIGHT = 'sight'
+VISIBILITY_MODES = (VISIBILITY_D4, VISIBILITY_RADIUS, VISIBILITY_SIGHT)
 
 
 class Character(object):
@@ -10,13 +20,17 @@ class Character(object):
 
     def __init__(self, game, *args, **kwargs):
         self.game = game
+        self.id = str(uuid4()).split('-')[0]
         self.inventory = Inventory(self)
         self.name = 'character'
         self.x = 0
         self.y = 0
         self.orientation = 0
         self.actions = {}
+        self.action_cache = {}  # {<action part>: (<inputs the actions were made from>, [<action>,...])}
         self.last_action = None
+        self.visibility = VISIBILITY_D4
+        self.visibility_radius = 4
         self.cell = self.get_map_cell()
 
     def __str__(self):
@@ -24,15 +38,16 @@ class Character(object):
 
         return self.name
 
-    def __is_valid_move(self, cell):
-        """Returns True if moving to cell is valid in current map, otherwise False."""
+    @property
+    def events(self):
+        """The event bus of the game."""
 
-        valid_move = True
+        return self.game.events
 
-        if cell is None or cell.is_blocked() or not cell.is_on_path():
-            valid_move = False
+    def __is_valid_move(self, x, y):
+        """Returns True if moving to x, y is valid in current map, otherwise False."""
 
-        return valid_move
+        return self.game.level.map.is_passable(x, y)
 
     def __on_move_update(self):
         """Update attributes that are location-dependent."""
@@ -41,8 +56,8 @@ class Character(object):
         self.cell = self.get_map_cell()
         for item in self.inventory.items:
             item.x, item.y = self.x, self.y
-        for cell in self.game.level.map.get_d4_cells(*self.location):
-            if cell is not None:
+        for cell in self.game.level.map.get_d4_cells(self.x, self.y):
+            if cell is not None and cell is not EMPTY_CELL:
                 cell.seen = True
 
     @property
@@ -59,13 +74,14 @@ class Character(object):
     def move_to(self, x, y):
         """Move character to cell at x, y if it's a valid move."""
 
-        to_cell = self.game.level.map.get_cell(x, y)
-        valid_move = self.__is_valid_move(to_cell)
+        valid_move = self.__is_valid_move(x, y)
 
         if valid_move:
+            previous_cell = self.cell
             self.x = x
             self.y = y
             self.__on_move_update()
+            self.events.publish(event.CHARACTER_MOVE, self, previous_cell)
         else:
             self.__on_move_update()
             raise error.MoveError("The requested move is invalid.")
@@ -94,6 +110,22 @@ class Character(object):
         self.orientation = 3
         self.move_to(self.x - 1, self.y)
 
+    def move_direction(self, direction):
+        """Move character one cell in the d4 direction if possible."""
+
+        move_functions = [self.move_up, self.move_right, self.move_down, self.move_left]
+        move_functions[direction]()
+
+    def get_route(self, x, y):
+        """Return the d4 directions of the shortest route from the character to the cell at x, y."""
+
+        route = self.game.level.map.pathfinder.get_route(self.x, self.y, x, y)
+
+        if route is None:
+            raise error.MoveError("There is no route to the requested cell.")
+
+        return route
+
     def take_item(self, item):
         """Remove item from its current inventory and add it to the character's inventory."""
 
@@ -104,76 +136,111 @@ class Character(object):
 
         return self.inventory.remove_item(item)
 
-    def get_visible_tools(self):
+    def set_visibility(self, visibility, radius=None):
+        """Set the visibility mode (e.g. VISIBILITY_SIGHT) and optionally the radius used by the wider modes."""
+
+        if visibility not in VISIBILITY_MODES:
+            raise ValueError("The visibility must be one of {0}.".format(', '.join(VISIBILITY_MODES)))
+
+        self.visibility = visibility
+
+        if radius is not None:
+            self.visibility_radius = radius
+
+    def get_neighborhood(self):
+        """Return a snapshot of the objects visible to the character, grouped by d4 direction."""
+
+        map = self.game.level.map
+
+        if self.visibility == VISIBILITY_D4:
+            return map.get_neighborhood(*self.location)
+
+        return map.get_visible_region(self.x, self.y, self.visibility_radius,
+                                      line_of_sight=self.visibility == VISIBILITY_SIGHT)
+
+    def get_visible_tools(self, neighborhood=None):
         """Return d4 tools visible to the player."""
 
+        if neighborhood is None:
+            neighborhood = self.get_neighborhood()
+
         d4_visible_tools = []
-        d4_tools = self.game.level.map.get_d4_tools(*self.location)
 
-        for tool_list in d4_tools:
+        for tool_list in neighborhood.tools:
             visible_tools = [tool for tool in tool_list if tool.visible is True]
             d4_visible_tools.append(visible_tools)
 
         return d4_visible_tools
 
-    def get_visible_parts(self):
+    def get_visible_parts(self, neighborhood=None):
         """Return d4 tools visible to the player."""
 
+        if neighborhood is None:
+            neighborhood = self.get_neighborhood()
+
         d4_visible_parts = []
-        d4_parts = self.game.level.map.get_d4_parts(*self.location)
 
-        for part_list in d4_parts:
+        for part_list in neighborhood.parts:
             visible_parts = [part for part in part_list if part.visible is True]
             d4_visible_parts.append(visible_parts)
 
         return d4_visible_parts
 
-    def get_visible_artifacts(self):
+    def get_visible_artifacts(self, neighborhood=None):
         """Return d4 artifacts visible to the player."""
 
+        if neighborhood is None:
+            neighborhood = self.get_neighborhood()
+
         d4_visible_artifacts = []
-        d4_artifacts = self.game.level.map.get_d4_artifacts(*self.location)
 
-        for artifact_list in d4_artifacts:
+        for artifact_list in neighborhood.artifacts:
             visible_artifacts = [artifact for artifact in artifact_list if artifact.visible is True]
             d4_visible_artifacts.append(visible_artifacts)
 
         return d4_visible_artifacts
 
-    def get_visible_items(self):
+    def get_visible_items(self, neighborhood=None):
         """Return d4 items visible to the player."""
 
-        visible_tools = self.get_visible_tools()
-        visible_parts = self.get_visible_parts()
-        visible_artifacts = self.get_visible_artifacts()
+        if neighborhood is None:
+            neighborhood = self.get_neighborhood()
+
+        visible_tools = self.get_visible_tools(neighborhood)
+        visible_parts = self.get_visible_parts(neighborhood)
+        visible_artifacts = self.get_visible_artifacts(neighborhood)
         visible_items = [items[0] + items[1] + items[2]
                          for items in zip(visible_artifacts, visible_tools, visible_parts)]
 
         return visible_items
 
-    def get_visible_interfaces(self):
+    def get_visible_interfaces(self, neighborhood=None):
         """Return d4 interfaces visible to the player."""
 
+        if neighborhood is None:
+            neighborhood = self.get_neighborhood()
+
         d4_visible_interfaces = []
-        d4_interfaces = self.game.level.map.get_d4_interfaces(*self.location)
 
-        for interface_list in d4_interfaces:
+        for direction, interface_list in enumerate(neighborhood.interfaces):
             visible_interfaces = []
             for interface in interface_list:
                 if interface.visible is True:
-                    if utility.d4_inverse(interface.orientation) == d4_interfaces.index(interface_list):
+                    if utility.d4_inverse(interface.orientation) == direction:
                         visible_interfaces.append(interface)
             d4_visible_interfaces.append(visible_interfaces)
 
         return d4_visible_interfaces
 
-    def get_visible_devices(self):
+    def get_visible_devices(self, neighborhood=None):
         """Return d4 devices visible to the player."""
 
+        if neighborhood is None:
+            neighborhood = self.get_neighborhood()
+
         d4_visible_devices = []
-        d4_devices = self.game.level.map.get_d4_devices(*self.location)
 
-        for device_list in d4_devices:
+        for device_list in neighborhood.devices:
             visible_devices = []
             for device in device_list:
                 if device.visible is True:
@@ -182,29 +249,35 @@ class Character(object):
 
         return d4_visible_devices
 
-    def get_visible_components(self):
+    def get_visible_components(self, neighborhood=None):
         """Return d4 components visible to the player."""
 
-        visible_interfaces = self.get_visible_interfaces()
-        visible_devices = self.get_visible_devices()
+        if neighborhood is None:
+            neighborhood = self.get_neighborhood()
+
+        visible_interfaces = self.get_visible_interfaces(neighborhood)
+        visible_devices = self.get_visible_devices(neighborhood)
         visible_components = [items[0] + items[1] for items in zip(visible_interfaces, visible_devices)]
 
         return visible_components
 
-    def get_visible_objects(self):
+    def get_visible_objects(self, neighborhood=None):
         """Return all objects visible to the player."""
 
-        visible_components = self.get_visible_components()
-        visible_items = self.get_visible_items()
+        if neighborhood is None:
+            neighborhood = self.get_neighborhood()
+
+        visible_components = self.get_visible_components(neighborhood)
+        visible_items = self.get_visible_items(neighborhood)
         visible_objects = [items[0] + items[1] for items in zip(visible_components, visible_items)]
 
         return visible_objects
 
-    def get_interactive_objects(self):
+    def get_interactive_objects(self, neighborhood=None):
         """Return all visible objects with which the player can interact."""
 
         interactive_objects = []
-        visible_objects = self.get_visible_objects()
+        visible_objects = self.get_visible_objects(neighborhood)
 
         for obj_list in visible_objects:
             int_obj_list = [obj for obj in obj_list if obj.interactive is True]
@@ -212,158 +285,209 @@ class Character(object):
 
         return interactive_objects
 
-    def report_visible_tools(self):
+    def report_visible_tools(self, neighborhood=None):
         """Return string description of visible tools."""
 
-        visible_tools = self.get_visible_tools()
+        visible_tools = self.get_visible_tools(neighborhood)
 
         return utility.build_object_report_text(self.orientation, visible_tools)
 
-    def report_visible_parts(self):
+    def report_visible_parts(self, neighborhood=None):
         """Return string description of visible parts."""
 
-        visible_parts = self.get_visible_parts()
+        visible_parts = self.get_visible_parts(neighborhood)
 
         return utility.build_object_report_text(self.orientation, visible_parts)
 
-    def report_visible_artifacts(self):
+    def report_visible_artifacts(self, neighborhood=None):
         """Return string description of visible artifacts."""
 
-        visible_artifacts = self.get_visible_artifacts()
+        visible_artifacts = self.get_visible_artifacts(neighborhood)
 
         return utility.build_object_report_text(self.orientation, visible_artifacts)
 
-    def report_visible_items(self):
+    def report_visible_items(self, neighborhood=None):
         """Return string description of visible items (tools, parts, and artifacts)."""
 
-        visible_items = self.get_visible_items()
+        visible_items = self.get_visible_items(neighborhood)
 
         return utility.build_object_report_text(self.orientation, visible_items)
 
-    def report_visible_interfaces(self):
+    def report_visible_interfaces(self, neighborhood=None):
         """Return string description of visible interfaces."""
 
-        visible_interfaces = self.get_visible_interfaces()
+        visible_interfaces = self.get_visible_interfaces(neighborhood)
 
         return utility.build_object_report_text(self.orientation, visible_interfaces)
 
-    def report_visible_devices(self):
+    def report_visible_devices(self, neighborhood=None):
         """Return string description of visible devices."""
 
-        visible_devices = self.get_visible_devices()
+        visible_devices = self.get_visible_devices(neighborhood)
 
         return utility.build_object_report_text(self.orientation, visible_devices)
 
-    def report_visible_components(self):
+    def report_visible_components(self, neighborhood=None):
         """Return string description of visible components (interfaces and devices)."""
 
-        visible_components = self.get_visible_components()
+        visible_components = self.get_visible_components(neighborhood)
 
         return utility.build_object_report_text(self.orientation, visible_components)
 
-    def report_visible_objects(self):
+    def report_visible_objects(self, neighborhood=None):
         """Return string description of visible objects (components and items)."""
 
-        visible_objects = self.get_visible_objects()
+        visible_objects = self.get_visible_objects(neighborhood)
 
         return utility.build_object_report_text(self.orientation, visible_objects)
 
+    def __get_cached_actions(self, part, key, make_actions):
+        """Return the cached actions of the part if they were made from the same inputs, otherwise make them."""
+
+        cached = self.action_cache.get(part)
+
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        actions = make_actions()
+        self.action_cache[part] = (key, actions)
+
+        return actions
+
     def get_actions(self):
-        """Return dictionary of actions based on player inventory and d4 visible objects."""
+        """Return dictionary of actions based on player inventory and d4 visible objects.
+
+        Map, tool and part actions are cached separately and made again only when the visible
+        objects, the inventory, or the states of the visible devices they depend on change."""
+
+        # snapshot of the d4 cells shared by all visibility checks, actions need adjacency in every visibility mode
+        neighborhood = self.game.level.map.get_neighborhood(*self.location)
+        orientation = self.orientation
+
+        visible_interfaces = self.get_visible_interfaces(neighborhood)
+        visible_devices = self.get_visible_devices(neighborhood)
+        visible_items = self.get_visible_items(neighborhood)
+        visible_objects = [items[0] + items[1] + items[2]
+                           for items in zip(visible_interfaces, visible_devices, visible_items)]
 
         # tools in the player inventory
-        character_tool_list = self.inventory.get_tools()
+        character_tool_list = tuple(self.inventory.get_tools())
 
         # parts in the player inventory
-        character_part_list = self.inventory.get_parts()
+        character_part_list = tuple(self.inventory.get_parts())
 
         # visible devices on the map
-        map_device_list = [device
-            for device_list in utility.d4_to_player_list(self.orientation, self.get_visible_devices())
+        map_device_list = tuple(device
+            for device_list in utility.d4_to_player_list(orientation, visible_devices)
             for device in device_list
-            if device.interactive is True]
+            if device.interactive is True)
 
         # visible interfaces on the map
-        map_interface_list = [interface
-            for interface_list in utility.d4_to_player_list(self.orientation, self.get_visible_interfaces())
+        map_interface_list = tuple(interface
+            for interface_list in utility.d4_to_player_list(orientation, visible_interfaces)
             for interface in interface_list
-            if interface.interactive is True]
+            if interface.interactive is True)
 
         # visible game objects on the map
-        map_gameobject_list = [gameobject
-            for gameobject_list in utility.d4_to_player_list(self.orientation, self.get_visible_objects())
+        map_gameobject_list = tuple(gameobject
+            for gameobject_list in utility.d4_to_player_list(orientation, visible_objects)
             for gameobject in gameobject_list
-            if gameobject.inspectable is True]
+            if gameobject.inspectable is True)
 
         # visible items on the map (includes tools)
-        map_item_list = [item
-            for item_list in utility.d4_to_player_list(self.orientation, self.get_visible_items())
+        map_item_list = tuple(item
+            for item_list in utility.d4_to_player_list(orientation, visible_items)
             for item in item_list
-            if item.interactive is True]
+            if item.interactive is True)
+
+        # examine descriptions print the object, whose text can follow its state, and tell apart same
+        # looking objects by their direction among all visible objects
+        if self.visibility == VISIBILITY_D4:
+            examine_context = tuple(tuple(objects) for objects in visible_objects)
+        else:
+            examine_context = tuple(tuple(objects) for objects in self.get_visible_objects())
 
         # actions to use tools on devices
-        tool_actions = [
-            ItemAction(
-                game=self.game,
-                function=tool.get_use_function(device),
-                description=tool.use_action_text(device),
-                item=tool,
-                device=device)
-            for tool in character_tool_list
-            for device in map_device_list
-            if tool.can_activate(device)]
+        tool_actions = self.__get_cached_actions(
+            'tool',
+            (character_tool_list, map_device_list, tuple((d.enabled, d.active) for d in map_device_list)),
+            lambda: [
+                ItemAction(
+                    game=self.game,
+                    function=tool.get_use_function(device),
+                    description=tool.use_action_text(device),
+                    item=tool,
+                    device=device)
+                for tool in character_tool_list
+                for device in map_device_list
+                if tool.can_activate(device)])
 
         # actions to use parts on devices
-        part_actions = [
-            ItemAction(
-                game=self.game,
-                function=part.get_use_function(device),
-                description=part.use_action_text(device),
-                item=part,
-                device=device)
-            for part in character_part_list
-            for device in map_device_list
-            if part.can_enable(device)]
+        part_actions = self.__get_cached_actions(
+            'part',
+            (character_part_list, map_device_list, tuple((d.enabled, d.active) for d in map_device_list)),
+            lambda: [
+                ItemAction(
+                    game=self.game,
+                    function=part.get_use_function(device),
+                    description=part.use_action_text(device),
+                    item=part,
+                    device=device)
+                for part in character_part_list
+                for device in map_device_list
+                if part.can_enable(device)])
 
         # actions for player to use interfaces
-        interface_actions = [
-            PlayerAction(
-                game=self.game,
-                function=interface.use,
-                description=interface.action_text(),
-                target=interface)
-            for interface in map_interface_list]
+        interface_actions = self.__get_cached_actions(
+            'interface',
+            map_interface_list,
+            lambda: [
+                PlayerAction(
+                    game=self.game,
+                    function=interface.use,
+                    description=interface.action_text(),
+                    target=interface)
+                for interface in map_interface_list])
 
         # actions for player to examine game objects
-        gameobject_actions = [
-            PlayerAction(
-                game=self.game,
-                function=gameobject.examine,
-                description=gameobject.examine_action_text(),
-                target=gameobject)
-            for gameobject in map_gameobject_list]
+        gameobject_actions = self.__get_cached_actions(
+            'gameobject',
+            (self.location, orientation, map_gameobject_list, examine_context,
+             tuple(str(gameobject) for gameobject in map_gameobject_list)),
+            lambda: [
+                PlayerAction(
+                    game=self.game,
+                    function=gameobject.examine,
+                    description=gameobject.examine_action_text(),
+                    verb='examine',
+                    target=gameobject)
+                for gameobject in map_gameobject_list])
 
         # actions for player to take items from map
-        item_actions = [
-            PlayerAction(
-                game=self.game,
-                function=item.map_to_player,
-                description=item.take_action_text(),
-                target=item)
-            for item in map_item_list]
+        item_actions = self.__get_cached_actions(
+            'item',
+            map_item_list,
+            lambda: [
+                PlayerAction(
+                    game=self.game,
+                    function=item.map_to_player,
+                    description=item.take_action_text(),
+                    verb='take',
+                    target=item)
+                for item in map_item_list])
 
         # combined list of all actions
         actions_list = interface_actions + tool_actions + part_actions + gameobject_actions + item_actions
 
         # dictionary of key: action object pairs
-        actions = {actions_list.index(action) + 1: action for action in actions_list}
+        actions = {number: action for number, action in enumerate(actions_list, start=1)}
 
         return actions
 
     def update_actions(self):
-        """Set the currently available actions."""
+        """Set the currently available actions, keeping the action objects that are still available."""
 
-        self.actions = self.get_actions()
+        self.actions = merge_actions(self.actions, self.get_actions())
 
     def do_action(self, key):
         """Call the action function associated with the provided key."""
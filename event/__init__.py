@@ -0,0 +1 @@
+from .event import *
@@ -0,0 +1,63 @@
+# event types, indexed like EventBus.subscribers
+DEVICE_ACTIVE = 0       # source: device
+DEVICE_ENABLED = 1      # source: device
+PROPERTY_VALUE = 2      # source: property
+INVENTORY_ADD = 3       # source: inventory, subject: item
+INVENTORY_REMOVE = 4    # source: inventory, subject: item
+CELL_CONTENTS = 5       # source: map cell, subject: added or removed game object
+CELL_BLOCKED = 6        # source: map cell
+CHARACTER_MOVE = 7      # source: character, subject: map cell the character left
+SYSTEM_CHANGE = 8       # source: system, subject: list of devices changed by a transaction
+
+EVENT_TYPES = range(9)
+
+
+class EventBus(object):
+    """Dispatches state-change events from game objects to subscribed callbacks."""
+
+    def __init__(self):
+        # [{<source or None for any source>: [<callback>,...]},...] indexed by event type
+        self.subscribers = [{} for event_type in EVENT_TYPES]
+
+    def subscribe(self, event_type, callback, source=None):
+        """Call callback(event_type, source, subject) for events of the type, optionally only from source."""
+
+        self.subscribers[event_type].setdefault(source, []).append(callback)
+
+    def unsubscribe(self, event_type, callback, source=None):
+        """Stop calling the callback for events of the type from source."""
+
+        handlers = self.subscribers[event_type]
+        callbacks = handlers.get(source)
+
+        if callbacks is None or callback not in callbacks:
+            raise ValueError("The callback is not subscribed to the event.")
+
+        callbacks.remove(callback)
+
+        if not callbacks:
+            del handlers[source]
+
+    def has_subscribers(self, event_type):
+        """Return True if any callback is subscribed to events of the type, otherwise False."""
+
+        return bool(self.subscribers[event_type])
+
+    def publish(self, event_type, source, subject=None):
+        """Dispatch the event to the callbacks for any source and then those for the source."""
+
+        handlers = self.subscribers[event_type]
+
+        # nothing is built when no one listens
+        if not handlers:
+            return
+
+        callbacks = handlers.get(None)
+        if callbacks:
+            for callback in tuple(callbacks):
+                callback(event_type, source, subject)
+
+        callbacks = handlers.get(source)
+        if callbacks:
+            for callback in tuple(callbacks):
+                callback(event_type, source, subject)
@@ -1,6 +1,9 @@
 import os
 import utility
 from level import Level
+from level.template import get_level_template
+from event import EventBus
+from game.tick import Tick
 from game.gameio import Control
 from game.gameui import MainUI
 from game.gameui import StartUI
@@ -18,6 +21,8 @@ class Game(object):
 
         self.debug = debug
         self.control = Control(self)
+        self.events = EventBus()
+        self.tick = None  # facts of the running main loop iteration
         self.level = Level(self)
         self.player = Player(self)
         self.ui = StartUI(self)
@@ -35,8 +40,11 @@ class Game(object):
     def setup_level(self, level_number):
         """Setup the game level."""
 
-        self.level = Level(self, level_number)
-        self.level.build()
+        # levels are compiled once, then cloned for every start and restart
+        self.tick = None
+        self.level.detach()
+        self.level = get_level_template(self, level_number).make_level(self)
+        self.level.attach()
 
         if not self.debug:
             utility.save_object(self, 'level_start')
@@ -48,6 +56,10 @@ class Game(object):
         enter_coords = map_config['coord_enter']
         enter_orientation = map_config['orientation_enter']
 
+        # actions of the previous level refer to its objects, which share ids with the new level
+        self.player.actions = {}
+        self.player.action_cache = {}
+
         self.player.orientation = enter_orientation
         self.player.move_to(*enter_coords)
         self.player.last_action = None
@@ -68,23 +80,33 @@ class Game(object):
 
         self.__init__()
 
+    def get_tick(self):
+        """Return the facts of the running main loop iteration, or of the current state outside of the main loop."""
+
+        if self.tick is None:
+            return Tick(self)
+
+        return self.tick
+
     def mainloop(self):
         """The main game loop."""
 
         while True:
 
+            # facts derived from the world are computed at most once per iteration
+            self.tick = Tick(self)
+
             if isinstance(self.ui, StartUI):
                 # skip StartUI in debug mode
                 if self.debug is True:
                     self.ui = MainUI(game=self)
 
             if isinstance(self.ui, MainUI):
-                if self.player.cell.has_story() and not self.player.cell.story_seen:
+                if self.tick.has_unseen_story:
                     self.ui = StoryUI(game=self)
-                if self.level.kills_player():
-                    death = self.level.get_death()
-                    self.ui = PlayerDeadUI(game=self, message=death.description)
-                if self.level.is_complete():
+                if self.tick.kills_player:
+                    self.ui = PlayerDeadUI(game=self, message=self.tick.death.description)
+                if self.tick.is_complete:
                     if self.level.has_next_level():
                         self.ui.next_level()
                     else:
@@ -92,3 +114,6 @@ class Game(object):
                     continue
 
             self.ui.process_input(self.ui.prompt())
+
+            # the input changed the world
+            self.tick = None
@@ -27,6 +27,12 @@ elif operating_system == 'linux':
 else:
     raise SystemError('Operating system {0} not supported.'.format(operating_system))
 
+# tab completion is available where python is built with readline
+try:
+    import readline
+except ImportError:
+    readline = None
+
 
 class Control(object):
 
@@ -38,6 +44,7 @@ class Control(object):
         self.QUIT = 113
         self.RESTART = 114
         self.INVENTORY = 105
+        self.TRAVEL = 116
         self.UP = 72
         self.LEFT = 75
         self.RIGHT = 77
@@ -62,9 +69,31 @@ class Control(object):
         else:
             raise SystemError('Operating system {0} not recognized.'.format(operating_system))
 
-    def get_input(self, message):
+    def get_input(self, message, completer=None):
+        """Return a line of input, offering tab completion from completer(line) if readline is available."""
+
+        if completer is None or readline is None:
+            return input(message)
+
+        candidates = []
+
+        def complete(text, state):
+            if state == 0:
+                line = readline.get_line_buffer()[:readline.get_endidx()]
+                candidates[:] = completer(line)
+            return candidates[state] if state < len(candidates) else None
 
-        return input(message)
+        previous_completer = readline.get_completer()
+        previous_delims = readline.get_completer_delims()
+        readline.set_completer(complete)
+        readline.set_completer_delims(' ')
+        readline.parse_and_bind('tab: complete')
+
+        try:
+            return input(message)
+        finally:
+            readline.set_completer(previous_completer)
+            readline.set_completer_delims(previous_delims)
 
     def get_keypress(self):
 
@@ -72,8 +101,8 @@ class Control(object):
 
             keycode = ord(getch())
 
-            # enter, e, i, q, r
-            if keycode in (self.ENTER, self.INVENTORY, self.QUIT, self.RESTART):
+            # enter, i, q, r, t
+            if keycode in (self.ENTER, self.INVENTORY, self.QUIT, self.RESTART, self.TRAVEL):
                 return keycode
             # digits (0-9)
             if keycode in self.DIGITS.keys():
@@ -269,6 +269,10 @@ class MainUI(BaseUI):
                     self.leave()
             elif value == self.game.control.INVENTORY:
                 self.game.ui = InventoryUI(self.game.player.inventory)
+            # process travel input
+            elif value == self.game.control.TRAVEL:
+                self.display()
+                self.travel(input(self.decorate_ui('Where should I go (x y)? ')))
             # the value wasn't handled
             else:
                 pass
@@ -293,6 +297,30 @@ class MainUI(BaseUI):
 
             return response
 
+    def travel(self, response):
+        """Move the player along the shortest route to a seen cell given as 'x y'."""
+
+        try:
+            x, y = (int(value) for value in response.replace(',', ' ').split())
+        except ValueError:
+            raise error.MoveError("The travel destination must be two coordinates.")
+
+        target_cell = self.game.level.map.get_cell(x, y)
+
+        if target_cell is None or target_cell.seen is False:
+            raise error.MoveError("The travel destination has not been seen.")
+
+        player = self.game.player
+
+        for direction in player.get_route(x, y):
+            player.move_direction(direction)
+
+            # stop where the main loop has to take over (story, death, or level exit)
+            if player.cell.has_story() and not player.cell.story_seen:
+                break
+            if self.game.level.kills_player() or self.game.level.is_complete():
+                break
+
     def add_map_player(self, text_map):
         """Add the player to the map."""
 
@@ -355,7 +383,7 @@ class MainUI(BaseUI):
             'up    - move up          q - save and quit      {0} - Player\n'
             'down  - move down        r - restart level      . - Path\n'
             'left  - move left        i - inventory\n'
-            'right - move right'
+            'right - move right       t - travel to cell'
         ).format(player_symbol)
 
         return commands
@@ -379,7 +407,8 @@ class MainUI(BaseUI):
         ui_commands = self.get_commands()
         ui_map = self.get_map()
         ui_alert = self.get_alert()
-        ui_report = utility.format_ui_text(self.game.player.report_visible_objects())
+        tick = self.game.get_tick()
+        ui_report = utility.format_ui_text(tick.visible_objects_report)
         ui_action = self.get_actions()
 
         ui_elements.append(ui_title)
@@ -404,10 +433,10 @@ class MainUI(BaseUI):
                 'Player X: {0}'.format(self.game.player.x) + '\n' +
                 'Player Y: {0}'.format(self.game.player.y) + '\n' +
                 'Player orientation: {0}'.format(self.game.player.orientation) + '\n' +
-                'Visible items: {0}'.format(self.game.player.get_visible_items()) + '\n' +
-                'Visible devices: {0}'.format(self.game.player.get_visible_devices()) + '\n' +
-                'Visible interfaces: {0}'.format(self.game.player.get_visible_interfaces()) + '\n' +
-                'Visible objects: {0}'.format(self.game.player.get_visible_objects()) + '\n' +
+                'Visible items: {0}'.format(self.game.player.get_visible_items(tick.neighborhood)) + '\n' +
+                'Visible devices: {0}'.format(self.game.player.get_visible_devices(tick.neighborhood)) + '\n' +
+                'Visible interfaces: {0}'.format(self.game.player.get_visible_interfaces(tick.neighborhood)) + '\n' +
+                'Visible objects: {0}'.format(self.game.player.get_visible_objects(tick.neighborhood)) + '\n' +
                 # 'Map items: {0}'.format(', '.join(str(i) for i in self.game.level.map.items)) + '\n' +
                 'Map devices: {0}'.format(', '.join(str(i) for i in self.game.level.map.devices)) + '\n' +
                 'Map interfaces: {0}'.format(', '.join(str(i) for i in self.game.level.map.interfaces)) + '\n' +
@@ -679,7 +708,7 @@ class TerminalUI(BaseUI):
                     '  help - display information about terminal commands\n'
                     '  exit - log out of the terminal session\n'
                     '  get-device [id] - list system devices\n'
-                    '  set-device {id} {-active} {0 | 1} - set device state')
+                    '  set-device {id} [id ...] {-active} {0 | 1} - set device state, id* sets all matching devices')
 
         def exit():
             self.leave()
@@ -705,17 +734,18 @@ class TerminalUI(BaseUI):
                 raise error.CommandError('Device not found.')
 
         def set_device(*args):
-            # args: {id} {-active} {value}
+            # args: {id} [id ...] {-active} {value}, an id ending in * matches every device with that prefix
 
             # property name: valid values
             valid_properties = {'active': (0, 1)}
 
-            try:
-                device_id = args[0]
-                property_name = args[1].replace('-', '')
-                property_value = int(args[2])
-            except IndexError:
+            if len(args) < 3:
                 raise error.CommandError('Missing arguments for set-device.')
+
+            try:
+                device_ids = args[:-2]
+                property_name = args[-2].replace('-', '')
+                property_value = int(args[-1])
             except (AttributeError, ValueError):
                 raise error.CommandError('Invalid arguments for set-device.')
 
@@ -727,24 +757,52 @@ class TerminalUI(BaseUI):
             else:
                 property_value = bool(property_value)
 
-            devices = self.terminal.get_devices(device_id=device_id)
+            devices = []
+
+            for device_id in device_ids:
+                if device_id.endswith('*'):
+                    matches = self.terminal.get_devices(device_id=device_id[:-1])
+                    if len(matches) == 0:
+                        raise error.CommandError('Device not found.')
+                    devices.extend(matches)
+                    continue
+                device = self.terminal.resolve_device(device_id)
+                if device is None:
+                    if self.terminal.get_devices(device_id=device_id):
+                        raise error.CommandError('Device not set. Multiple matching devices.')
+                    raise error.CommandError('Device not found.')
+                devices.append(device)
+
+            # the same device may match several ids
+            devices = list(dict.fromkeys(devices))
+            system = self.game.level.system
+
+            if len(device_ids) == 1 and len(devices) == 1:
+                device = devices[0]
+                if property_name == 'active':
+                    if property_value is True:
+                        result = system.activate_device(device)
+                    else:
+                        result = system.deactivate_device(device)
+
+                if isinstance(result, str):
+                    raise error.CommandError(result)
+
+                return
+
+            # several devices change together, checked against their final states
+            transaction = system.begin_transaction()
+
+            for device in devices:
+                if property_name == 'active':
+                    transaction.set_active(device, property_value)
 
-            if len(devices) == 0:
-                raise error.CommandError('Device not found.')
-
-            if len(devices) > 1:
-                raise error.CommandError('Device not set. Multiple matching devices.')
-
-            device = devices[0]
-
-            if property_name == 'active':
-                if property_value is True:
-                    result = self.game.level.system.activate_device(device)
-                else:
-                    result = self.game.level.system.deactivate_device(device)
+            try:
+                changed_devices = transaction.commit()
+            except error.SystemError as e:
+                raise error.CommandError('Devices not set. {0}'.format(e))
 
-            if isinstance(result, str):
-                raise error.CommandError(result)
+            return '{0} of {1} devices set.'.format(len(changed_devices), len(devices))
 
         valid_commands = {
             'help': help,
@@ -777,6 +835,33 @@ class TerminalUI(BaseUI):
             else:
                 raise error.CommandError('Command \'{0}\' not found.'.format(' '.join(parts)))
 
+    def get_completions(self, line):
+        """Return the completion candidates for the last word of a partially typed command line."""
+
+        words = line.lower().split()
+        current = words.pop() if words and not line[-1].isspace() else ''
+
+        if words and words[0] == 'sudo':
+            words = words[1:]
+            candidates = ('help', 'exit', 'get-device', 'set-device')
+        else:
+            candidates = ('help', 'exit', 'get-device', 'set-device', 'sudo')
+
+        if len(words) == 0:
+            return [c for c in candidates if c.startswith(current)]
+
+        if words[0] == 'get-device' and len(words) == 1:
+            return self.terminal.get_device_completions(current)
+
+        # set-device takes any number of ids before the flag
+        if words[0] == 'set-device' and '-active' not in words[1:]:
+            completions = self.terminal.get_device_completions(current)
+            if len(words) > 1:
+                completions += [c for c in ('-active',) if c.startswith(current)]
+            return completions
+
+        return []
+
     def process_input(self, value):
         """Call the appropriate method based on input value."""
 
@@ -805,7 +890,7 @@ class TerminalUI(BaseUI):
             # update the display
             self.terminal.update_actions()
             self.display()
-            response = self.game.control.get_input(message=message)
+            response = self.game.control.get_input(message=message, completer=self.get_completions)
             if utility.is_empty_response(response):
                 continue
             return response
@@ -0,0 +1,68 @@
+# marks a fact that has not been computed during the tick yet
+UNSET = object()
+
+
+class Tick(object):
+    """Facts derived from the game world for one main loop iteration, each computed at most once.
+
+    The world must not change while a tick is in use; the main loop drops the tick once the input
+    of the iteration has been processed."""
+
+    def __init__(self, game):
+        self.game = game
+        self._death = UNSET
+        self._neighborhood = UNSET
+        self._visible_objects_report = UNSET
+
+    @property
+    def player_cell(self):
+        """The map cell the player stands on."""
+
+        return self.game.player.cell
+
+    @property
+    def has_unseen_story(self):
+        """True if the player's cell has story text the player has not seen, otherwise False."""
+
+        cell = self.player_cell
+
+        return cell.has_story() and not cell.story_seen
+
+    @property
+    def death(self):
+        """The first death scenario satisfied, otherwise None."""
+
+        if self._death is UNSET:
+            self._death = self.game.level.get_death()
+
+        return self._death
+
+    @property
+    def kills_player(self):
+        """True if the level is in a state that kills the player, otherwise False."""
+
+        return self.death is not None
+
+    @property
+    def is_complete(self):
+        """True if the player is at the final cell of the level, otherwise False."""
+
+        return self.player_cell is self.game.level.map.exit_cell
+
+    @property
+    def neighborhood(self):
+        """Snapshot of the objects visible to the player."""
+
+        if self._neighborhood is UNSET:
+            self._neighborhood = self.game.player.get_neighborhood()
+
+        return self._neighborhood
+
+    @property
+    def visible_objects_report(self):
+        """String description of the objects visible to the player."""
+
+        if self._visible_objects_report is UNSET:
+            self._visible_objects_report = self.game.player.report_visible_objects(self.neighborhood)
+
+        return self._visible_objects_report
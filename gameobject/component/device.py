@@ -1,4 +1,5 @@
 import error
+import event
 from gameobject.component import Component
 
 
@@ -8,6 +9,11 @@ from gameobject.component import Component
 class Device(Component):
     """A piece of mechanical or electrical equipment that may be controlled by an interface."""
 
+    # flags are kept here until the device joins a system, then in its slot of the system state
+    _active = None
+    _enabled = None
+    _state_slot = None
+
     def __init__(self, *args, **kwargs):
         super(Device, self).__init__(*args, **kwargs)
         self.__add_to_system()
@@ -16,6 +22,7 @@ class Device(Component):
         self.active = False
         self.dependencies = []
         self.override_dependencies = False
+        self.operable = True  # cached result of the dependency checks, kept current by the system
         self.msg_action_true = "activate"
         self.msg_action_false = "deactivate"
         self.msg_active_true = "active"
@@ -31,6 +38,60 @@ class Device(Component):
 
         self.system.add_device(self)
 
+    def update_map_cell(self):
+        """Update the blocked state of the map cell that holds this device."""
+
+        cell = self.system.level.map.get_cell(*self.location)
+
+        if cell is not None and self in cell.devices:
+            cell.update_blocked()
+
+    @property
+    def active(self):
+        """Return the active state of the device."""
+
+        if self._state_slot is None:
+            return self._active
+        return self.system.state.get_active(self._state_slot)
+
+    @active.setter
+    def active(self, value):
+        changed = value != self.active
+
+        if self._state_slot is None:
+            self._active = value
+        else:
+            self.system.state.set_active(self._state_slot, value)
+
+        self.update_map_cell()
+
+        # a committing transaction updates dependents and notifies once for all of its devices
+        if self.system.committing is None:
+            self.system.update_dependents(self)
+            if changed:
+                self.game.events.publish(event.DEVICE_ACTIVE, self)
+
+    @property
+    def enabled(self):
+        """Return the enabled state of the device."""
+
+        if self._state_slot is None:
+            return self._enabled
+        return self.system.state.get_enabled(self._state_slot)
+
+    @enabled.setter
+    def enabled(self, value):
+        changed = value != self.enabled
+
+        if self._state_slot is None:
+            self._enabled = value
+        else:
+            self.system.state.set_enabled(self._state_slot, value)
+        self.system.update_dependents(self)
+
+        if changed:
+            self.game.events.publish(event.DEVICE_ENABLED, self)
+
     def action_text(self):
         """Return text description of the currently available action."""
 
@@ -98,6 +159,7 @@ class Device(Component):
             raise error.DeviceError("The dependency already exists for the device.")
 
         self.dependencies.append(dependency)
+        self.system.compile_dependencies(self)
 
     def remove_dependency(self, device_id):
         """Remove the dependencies from the device."""
@@ -106,19 +168,17 @@ class Device(Component):
         for dependency in remove_dependencies:
             self.dependencies.remove(dependency)
 
+        self.system.compile_dependencies(self)
+
     def dependencies_met(self):
         """True if all dependencies have been met, otherwise False."""
 
-        if self.override_dependencies is True:
-            return True
+        return self.override_dependencies is True or self.operable
+
+    def update_operable(self):
+        """Recompute the cached operable state from the compiled dependencies."""
 
-        for dependency in self.dependencies:
-            device = self.system.get_device(dependency['device_id'])
-            if device.enabled != dependency['enabled_state']:
-                return False
-            if device.active != dependency['active_state']:
-                return False
-        return True
+        self.operable = self.system.are_dependencies_met(self)
 
     def get_properties(self):
         """Return the properties related to this device."""
@@ -128,16 +188,11 @@ class Device(Component):
     def use(self):
         """Use the device."""
 
-        property_list = self.get_properties()
         toggled = self.toggle_active_state()
 
-        # sensors do not affect related property values (no quantum strangeness here)
-        if not isinstance(self, Sensor):
-            for property in property_list:
-                if toggled and self.active is True:
-                    property.increase()
-                elif toggled and self.active is False:
-                    property.decrease()
+        # the property engine skips sensors, they do not affect related property values (no quantum strangeness here)
+        if toggled:
+            self.system.property_engine.queue(self, 1 if self.active is True else -1)
 
 
 # Device sub-classes that can be controlled by interfaces, activated with tools, and repaired with parts
@@ -252,8 +307,7 @@ class DeviceFactory(object):
 
     def make_from_config(self, system, device_config, level_number):
 
-        new_device = self.make_device(system, device_config['type'])
-        new_device.config_id = device_config['id']
+        new_device = self.make_device(system, device_config['type'], config_id=device_config['id'])
         new_device.level_number = level_number
         new_device.name = device_config['name']
         new_device.description = device_config['description']
@@ -5,6 +5,7 @@ from game.gameui import WeatherStationUI
 from gameobject.component import Component
 from gameobject.component.device import Sensor
 from action import InterfaceAction
+from action import merge_actions
 
 
 # Base Interface class
@@ -33,15 +34,36 @@ class Interface(Component):
         return " ".join([self.msg_action_verb.capitalize(), "the", str(self)])
 
     def get_devices(self, device_id=None):
-        """Return the devices linked to this interface."""
+        """Return the devices linked to this interface, or those whose id starts with the device id ordered by id."""
 
         devices = self.system.get_interface_devices(self)
 
         if device_id is not None:
-            devices = [d for d in devices if device_id == d.id[:len(device_id)]]
+            if self.system.count_devices(device_id) < len(devices):
+                # fewer system devices share the prefix than are linked here
+                devices = [d for d in self.system.get_devices(device_id) if self.system.links.has(self, d)]
+            else:
+                devices = sorted((d for d in devices if d.id.startswith(device_id)), key=lambda d: d.id)
 
         return devices
 
+    def resolve_device(self, device_id):
+        """Return the only linked device whose id starts with the device id, otherwise None."""
+
+        device = self.system.resolve_device(device_id)
+
+        if device is not None:
+            return device if self.system.links.has(self, device) else None
+
+        devices = self.get_devices(device_id=device_id)
+
+        return devices[0] if len(devices) == 1 else None
+
+    def get_device_completions(self, device_id):
+        """Return the ids of linked devices that start with the device id."""
+
+        return [d.id for d in self.get_devices(device_id=device_id)]
+
     def use(self):
         """Use the interface."""
 
@@ -90,9 +112,9 @@ class Terminal(Interface):
         return actions
 
     def update_actions(self):
-        """Set the currently available action."""
+        """Set the currently available actions, keeping the action objects that are still available."""
 
-        self.actions = self.get_actions()
+        self.actions = merge_actions(self.actions, self.get_actions())
 
     def do_action(self, key):
         """Call the function associated with the provided key."""
@@ -210,8 +232,7 @@ class InterfaceFactory(object):
 
     def make_from_config(self, system, interface_config, level_number):
 
-        new_interface = self.make_interface(system, interface_config['type'])
-        new_interface.config_id = interface_config['id']
+        new_interface = self.make_interface(system, interface_config['type'], config_id=interface_config['id'])
         new_interface.level_number = level_number
         new_interface.name = interface_config['name']
         new_interface.description = interface_config['description']
@@ -9,7 +9,7 @@ class GameObject(object):
     def __init__(self, game, *args, **kwargs):
         self.game = game
         self.id = str(uuid4()).split('-')[0]
-        self.config_id = None
+        self.config_id = kwargs.get('config_id')  # set before the object adds itself to the system indexes
         self.level_number = None
         self.name = ''
         self.description = 'generic object'
@@ -1,3 +1,4 @@
+import functools
 import error
 from gameobject.component import device
 from gameobject.item import Item
@@ -15,17 +16,16 @@ class Part(Item):
         return (test_device.enabled is False
                 and isinstance(test_device, device.Device))
 
-    def get_use_function(self, target_device):
-        """Return an ad-hoc function for enabling the device."""
+    def enable_device(self, target_device):
+        """Enable the device, using up this part."""
 
-        part_inventory = self.inventory
-        part_id = self.id
+        target_device.enabled = True
+        self.inventory.remove_item_by_id(self.id)
 
-        def enable_device():
-            target_device.enabled = True
-            part_inventory.remove_item_by_id(part_id)
+    def get_use_function(self, target_device):
+        """Return a function for enabling the device; a partial, so actions holding it can be pickled."""
 
-        return enable_device
+        return functools.partial(self.enable_device, target_device)
 
     def use_action_text(self, target_device):
         """Return text description of the currently available action."""
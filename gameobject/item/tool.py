@@ -1,3 +1,4 @@
+import functools
 import error
 from gameobject.component import device
 from gameobject.item import Item
@@ -17,16 +18,18 @@ class Tool(Item):
                 and isinstance(test_device, device.Device)
                 and self.level_number == test_device.level_number)
 
-    def get_use_function(self, target_device):
-        """Return an ad-hoc function for activating the device."""
+    def activate_device(self, target_device):
+        """Use the device, regardless of its dependencies."""
+
+        override_state = target_device.override_dependencies
+        target_device.override_dependencies = True
+        target_device.use()
+        target_device.override_dependencies = override_state
 
-        def use_device():
-            override_state = target_device.override_dependencies
-            target_device.override_dependencies = True
-            target_device.use()
-            target_device.override_dependencies = override_state
+    def get_use_function(self, target_device):
+        """Return a function for activating the device; a partial, so actions holding it can be pickled."""
 
-        return use_device
+        return functools.partial(self.activate_device, target_device)
 
     def use_action_text(self, target_device):
         """Return text description of the currently available action."""
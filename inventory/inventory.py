@@ -1,4 +1,5 @@
 import error
+import event
 from gameobject.item import Item
 from gameobject.item.tool import Tool
 from gameobject.item.part import Part
@@ -23,6 +24,7 @@ class Inventory(object):
 
         item.inventory = self
         self.items.append(item)
+        self.owner.events.publish(event.INVENTORY_ADD, self, item)
 
     def remove_item(self, item):
         """Remove the item from the inventory and return it."""
@@ -31,7 +33,10 @@ class Inventory(object):
             raise error.InventoryError("The item does not exist in the inventory.")
 
         item.inventory = None
-        return self.items.pop(self.items.index(item))
+        removed_item = self.items.pop(self.items.index(item))
+        self.owner.events.publish(event.INVENTORY_REMOVE, self, removed_item)
+
+        return removed_item
 
     def remove_item_by_id(self, item_id):
         """Remove the item with the provided id from the inventory and return it."""
@@ -1,8 +1,53 @@
+from operator import eq
+from operator import gt
+from operator import lt
+import event
 from action import PlayerAction
 from action import InterfaceAction
 from action import ItemAction
 from error import ConfigError
 
+# property state operators, resolved when a death scenario compiles
+PROPERTY_OPERATORS = {'gt': gt, 'lt': lt, 'eq': eq}
+
+
+class DeathRule(object):
+    """A death scenario compiled into direct references to the devices and properties it checks.
+
+    Calling the rule evaluates the scenario; the cheapest checks run first and the first mismatch
+    returns False."""
+
+    __slots__ = ('game', 'location', 'device_states', 'property_states', 'action')
+
+    def __init__(self, death):
+        self.game = death.level.game
+        self.location = death.location
+        self.device_states = tuple((state['device'], state['active_state']) for state in death.device_states)
+        self.property_states = tuple((state['property'], PROPERTY_OPERATORS[state['operator']], state['value'])
+                                     for state in death.property_states)
+        # the key is read when evaluating, the player in it is only known once the level is played
+        self.action = death.action
+
+    def __call__(self):
+
+        if self.location is not None and self.location != self.game.player.location:
+            return False
+
+        for device, active_state in self.device_states:
+            if device.active != active_state:
+                return False
+
+        for prop, oper, value in self.property_states:
+            if not oper(prop.value, value):
+                return False
+
+        if self.action is not None:
+            last_action = self.game.player.last_action
+            if last_action is None or last_action.key != self.action.key:
+                return False
+
+        return True
+
 
 class Death(object):
     """Defines a death scenario."""
@@ -12,8 +57,20 @@ class Death(object):
         self.device_states = []
         self.property_states = []
         self.action = None
-        self.location = None
+        self._location = None
         self.description = 'You died.'
+        self.rule = None  # compiled scenario, dropped whenever the scenario changes
+
+    @property
+    def location(self):
+
+        return self._location
+
+    @location.setter
+    def location(self, location):
+
+        self._location = location
+        self.rule = None
 
     def is_valid(self):
 
@@ -34,6 +91,8 @@ class Death(object):
         device = self.level.system.get_device(config_id=config_id)
         self.device_states.append({'device': device, 'active_state': active_state})
 
+        self.rule = None
+
     def remove_device_state(self, config_id):
         """Remove a device state from the death scenario."""
 
@@ -41,6 +100,8 @@ class Death(object):
             if state['device'].config_id == config_id:
                 self.device_states.remove(state)
 
+        self.rule = None
+
     def add_device_states(self, device_states_config):
         """Add device states from config."""
 
@@ -50,6 +111,9 @@ class Death(object):
     def add_property_state(self, config_id, operator, value):
         """Add a property state to the death scenario."""
 
+        if operator not in PROPERTY_OPERATORS:
+            raise ValueError("Operator must be one of: gt, lt, eq.")
+
         for state in self.property_states:
             if config_id == state['property'].config_id:
                 raise ValueError("The property with config_id {0} has already been added to the death scenario.".format(config_id))
@@ -57,6 +121,8 @@ class Death(object):
         prop = self.level.system.get_property(config_id=config_id)
         self.property_states.append({'property': prop, 'operator': operator, 'value': value})
 
+        self.rule = None
+
     def remove_property_state(self, config_id):
         """Add a property state to the death scenario."""
 
@@ -64,6 +130,8 @@ class Death(object):
             if state['property'].config_id == config_id:
                 self.property_states.remove(state)
 
+        self.rule = None
+
     def add_property_states(self, property_states_config):
         """Add a property state to the death scenario."""
 
@@ -95,17 +163,20 @@ class Death(object):
                 game=self.level.game,
                 function=target.examine,
                 description=target.examine_action_text(),
+                verb='examine',
                 target=target)
         elif verb == 'take':
             player_action = PlayerAction(
                 game=self.level.game,
                 function=target.map_to_player,
                 description=target.take_action_text(),
+                verb='take',
                 target=target)
         else:
             raise ValueError("Argument verb must be one of: use, examine, take.")
 
         self.action = player_action
+        self.rule = None
 
     def set_action_interface(self, origin_config_id, target_config_id):
         """Add a player action to the death scenario."""
@@ -114,13 +185,14 @@ class Death(object):
         device = self.level.system.get_device(config_id=target_config_id)
 
         interface_action = InterfaceAction(
-            game=self.system.level.game,
+            game=self.level.game,
             function=device.use,
             description=device.action_text(),
             interface=interface,
             device=device)
 
         self.action = interface_action
+        self.rule = None
 
     def set_action_item(self, origin_type, origin_config_id, target_config_id):
         """Add an item action to the death scenario."""
@@ -142,6 +214,7 @@ class Death(object):
             device=target)
 
         self.action = item_action
+        self.rule = None
 
     def set_action(self, action_config):
         """Set action from config."""
@@ -162,52 +235,155 @@ class Death(object):
         else:
             raise ValueError("Configuration origin_type {0} must be one of: player, interface, tool, part.".format(origin_type))
 
+    def compile(self):
+        """Compile the scenario into a rule, so evaluating it no longer walks the scenario config."""
+
+        self.rule = DeathRule(self)
+
     def scenario_satisfied(self):
         """Returns True if current game conditions match the death scenario, otherwise False."""
 
-        devices_match = True
-        properties_match = True
-        action_match = True
-        location_match = True
-
-        # check device states
-        if len(self.device_states) > 0:
-            for device_state in self.device_states:
-                device = device_state['device']
-                expected_state = device_state['active_state']
-                devices_match = device.active == expected_state
-
-                if not devices_match:
-                    break
-
-        # check property states
-        if len(self.property_states) > 0:
-            for property_state in self.property_states:
-                prop = property_state['property']
-                oper = property_state['operator']
-                value = property_state['value']
-
-                if oper == 'gt':
-                    properties_match = prop.value > value
-                elif oper == 'lt':
-                    properties_match = prop.value < value
-                elif oper == 'eq':
-                    properties_match = prop.value == value
-                else:
-                    raise ValueError("Operator must be one of: gt, lt, eq.")
+        if self.rule is None:
+            self.compile()
 
-                if not properties_match:
-                    break
+        return self.rule()
 
-        # check action
-        if self.action is not None:
-            action_match = self.action == self.level.game.player.last_action
 
-        # check location
-        if self.location is not None:
-            location_match = self.location == self.level.game.player.location
+class DeathIndex(object):
+    """The deaths of a level indexed by the state they depend on, so only deaths whose state changed are re-evaluated.
+
+    Device and property changes arrive as events; the player location and last action are compared
+    against the values seen at the previous evaluation."""
+
+    def __init__(self, level):
+        self.level = level
+        self.deaths = []
+        self.device_deaths = {}     # {<device>: [<death position>,...]}
+        self.property_deaths = {}   # {<property>: [<death position>,...]}
+        self.location_deaths = {}   # {(x, y): [<death position>,...]}
+        self.action_deaths = {}     # {<action key>: [<death position>,...]}, indexed on subscribe
+        self.dirty = set()          # positions of deaths to re-evaluate
+        self.satisfied = set()      # positions of deaths satisfied at the last evaluation
+        self.death = None           # first satisfied death
+        self.location = None
+        self.last_action = None
+        self.events = None          # event bus the index is subscribed to
+
+    def build(self, deaths):
+        """Index the deaths, all of which are evaluated on the next call to get_death."""
 
-        return devices_match and properties_match and action_match and location_match
+        self.deaths = list(deaths)
+        self.device_deaths = {}
+        self.property_deaths = {}
+        self.location_deaths = {}
+        self.action_deaths = {}
+
+        for position, death in enumerate(self.deaths):
+            for state in death.device_states:
+                self.device_deaths.setdefault(state['device'], []).append(position)
+            for state in death.property_states:
+                self.property_deaths.setdefault(state['property'], []).append(position)
+            if death.location is not None:
+                self.location_deaths.setdefault(tuple(death.location), []).append(position)
+
+        self.dirty = set(range(len(self.deaths)))
+        self.satisfied = set()
+        self.death = None
+
+    def subscribe(self, events):
+        """Follow the device and property changes published on the event bus."""
+
+        if self.events is not None:
+            raise ValueError("The death index is already subscribed to an event bus.")
+
+        # action keys hold the id of the player, which a level cloned from a template only has now
+        self.action_deaths = {}
+
+        for position, death in enumerate(self.deaths):
+            if death.action is not None:
+                self.action_deaths.setdefault(death.action.key, []).append(position)
+
+        events.subscribe(event.DEVICE_ACTIVE, self.on_device_change)
+        events.subscribe(event.PROPERTY_VALUE, self.on_property_change)
+        events.subscribe(event.SYSTEM_CHANGE, self.on_system_change, source=self.level.system)
+        self.events = events
+
+    def unsubscribe(self):
+        """Stop following the event bus."""
+
+        if self.events is None:
+            return
+
+        self.events.unsubscribe(event.DEVICE_ACTIVE, self.on_device_change)
+        self.events.unsubscribe(event.PROPERTY_VALUE, self.on_property_change)
+        self.events.unsubscribe(event.SYSTEM_CHANGE, self.on_system_change, source=self.level.system)
+        self.events = None
+
+    def on_device_change(self, event_type, device, subject):
+
+        positions = self.device_deaths.get(device)
+
+        if positions:
+            self.dirty.update(positions)
+
+    def on_property_change(self, event_type, prop, subject):
+
+        positions = self.property_deaths.get(prop)
+
+        if positions:
+            self.dirty.update(positions)
+
+    def on_system_change(self, event_type, system, devices):
+
+        # transactions and restored snapshots change values without per-property events
+        self.dirty.update(range(len(self.deaths)))
+
+    def __mark(self, index, key):
+        """Mark the deaths indexed under the key for re-evaluation."""
+
+        positions = index.get(key)
+
+        if positions:
+            self.dirty.update(positions)
+
+    def get_death(self):
+        """Return the first death satisfied, otherwise None."""
+
+        player = self.level.game.player
+
+        # without events, any death may have changed
+        if self.events is None:
+            self.dirty.update(range(len(self.deaths)))
+
+        # queued device changes publish their property events when applied
+        self.level.system.property_engine.step()
+
+        location = player.location
+        if location != self.location:
+            self.__mark(self.location_deaths, self.location)
+            self.__mark(self.location_deaths, location)
+            self.location = location
+
+        action = player.last_action
+        if action is not self.last_action:
+            if self.last_action is not None:
+                self.__mark(self.action_deaths, self.last_action.key)
+            if action is not None:
+                self.__mark(self.action_deaths, action.key)
+            self.last_action = action
+
+        if self.dirty:
+            dirty, self.dirty = self.dirty, set()
+
+            for position in dirty:
+                if self.deaths[position].scenario_satisfied():
+                    self.satisfied.add(position)
+                else:
+                    self.satisfied.discard(position)
+
+            self.death = self.deaths[min(self.satisfied)] if self.satisfied else None
+
+        return self.death
 
 
 class DeathFactory(object):
@@ -236,4 +412,6 @@ class DeathFactory(object):
         if not death.is_valid():
             raise ConfigError("The provided death configuration is invalid.")
 
+        death.compile()
+
         return death
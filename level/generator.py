@@ -0,0 +1,293 @@
+import error
+import utility
+from random import Random
+from config import level_config
+
+
+GENERATED_WEATHER = {
+    'sol': None,
+    'time': None,
+    'temperature': {'value': None, 'units': 'C'},
+    'wind': {
+        'speed': {'value': None, 'units': 'KPH'},
+        'direction': {'value': None, 'units': 'Deg'}},
+    'pressure': {'value': None, 'units': 'Pa'}
+}
+
+
+class LevelGenerator(object):
+    """Generates seeded level configurations shaped like the entries of level_config."""
+
+    def __init__(self, seed=0, x_dim=16, y_dim=16, path_density=0.4, device_count=8,
+                 interface_count=4, item_count=8, death_count=2, property_count=2, sparse=False):
+        self.seed = seed
+        self.x_dim = x_dim
+        self.y_dim = y_dim
+        self.path_density = path_density
+        self.device_count = device_count
+        self.interface_count = interface_count
+        self.item_count = item_count
+        self.death_count = death_count
+        self.property_count = property_count
+        self.sparse = sparse
+
+        if x_dim < 2 or y_dim < 2:
+            raise error.ConfigError("Generated levels must be at least 2 x 2 cells.")
+
+        if not (0 < path_density <= 1):
+            raise ValueError("Path density must be greater than 0 and no more than 1.")
+
+    def make_config(self):
+        """Return a new level configuration."""
+
+        random = Random(self.seed)
+
+        path_coords = self.__make_path(random)
+        properties = self.__make_properties(random)
+        devices = self.__make_devices(random, path_coords)
+        interfaces = self.__make_interfaces(random)
+        tools, parts, artifacts = self.__make_items(random, path_coords)
+
+        config = {
+            'name': 'Generated {0}x{1} ({2})'.format(self.x_dim, self.y_dim, self.seed),
+            'map': {
+                'x_dimension': self.x_dim,
+                'y_dimension': self.y_dim,
+                'sparse': self.sparse,
+                'path_cells': [{'coordinates': coord, 'story': None} for coord in path_coords],
+                'coord_enter': path_coords[0],
+                'coord_exit': path_coords[-1],
+                'orientation_enter': 0,
+                'tools': tools,
+                'parts': parts,
+                'artifacts': artifacts
+            },
+            'system': {
+                'interfaces': interfaces,
+                'devices': devices,
+                'properties': properties,
+                'links': self.__make_links(random, interfaces, devices),
+                'relates': self.__make_relates(random, devices, properties)
+            },
+            'deaths': self.__make_deaths(random, devices, properties),
+            'weather': dict(GENERATED_WEATHER)
+        }
+
+        return config
+
+    def __random_coord(self, random):
+        """Return random coordinates on the map."""
+
+        return random.randrange(self.x_dim), random.randrange(self.y_dim)
+
+    def __make_path(self, random):
+        """Return the coordinates of a connected path, grown outward from a random start cell."""
+
+        path_size = max(2, int(self.x_dim * self.y_dim * self.path_density))
+        start = self.__random_coord(random)
+        path_coords = [start]
+        path_set = {start}
+        frontier = [start]
+
+        while frontier and len(path_coords) < path_size:
+            # swap-remove a random frontier cell and grow the path from it
+            i = random.randrange(len(frontier))
+            frontier[i], frontier[-1] = frontier[-1], frontier[i]
+            x, y = frontier[-1]
+            neighbors = [(x + dx, y + dy) for dx, dy in utility.D4_OFFSETS
+                         if 0 <= x + dx < self.x_dim and 0 <= y + dy < self.y_dim
+                         and (x + dx, y + dy) not in path_set]
+            if not neighbors:
+                frontier.pop()
+                continue
+            coord = random.choice(neighbors)
+            path_coords.append(coord)
+            path_set.add(coord)
+            frontier.append(coord)
+
+        return path_coords
+
+    def __make_properties(self, random):
+        """Return property configurations."""
+
+        properties = []
+
+        for config_id in range(self.property_count):
+            property_type = random.choice(('pressure', 'voltage'))
+            max_value = random.randrange(10, 100)
+            properties.append({
+                'id': config_id,
+                'name': property_type,
+                'description': '{0} {1}'.format(property_type, config_id),
+                'type': property_type,
+                'value': max_value // 2,
+                'min_value': 0,
+                'max_value': max_value,
+                'units': 'Pa' if property_type == 'pressure' else 'V',
+                'increment': 0
+            })
+
+        return properties
+
+    def __make_devices(self, random, path_coords):
+        """Return device configurations, with dependencies only on earlier devices."""
+
+        devices = []
+
+        for config_id in range(self.device_count):
+            device_type = random.choice(('door', 'switch', 'valve', 'camera', 'sensor'))
+            x, y = random.choice(path_coords)
+            dependencies = []
+            if config_id > 0 and random.random() < 0.25:
+                dependencies.append({
+                    'device_id': random.randrange(config_id),
+                    'enabled_state': True,
+                    'active_state': random.choice((True, False))})
+            devices.append({
+                'id': config_id,
+                'type': device_type,
+                'name': '{0} {1}'.format(device_type, config_id),
+                'description': device_type,
+                'report': '',
+                'inspectable': False,
+                'enabled': True,
+                # doors and valves start open so generated paths stay connected
+                'active': device_type in ('door', 'valve') or random.choice((True, False)),
+                'visible': True,
+                'x': x,
+                'y': y,
+                'msg_action_true': 'activate',
+                'msg_action_false': 'deactivate',
+                'msg_active_true': 'active',
+                'msg_active_false': 'inactive',
+                'msg_toggle_active_true': 'The device was activated.',
+                'msg_toggle_active_false': 'The device was deactivated.',
+                'msg_unmet_dependencies': 'The device has unmet dependencies.',
+                'dependencies': dependencies
+            })
+
+        return devices
+
+    def __make_interfaces(self, random):
+        """Return interface configurations."""
+
+        interfaces = []
+
+        for config_id in range(self.interface_count):
+            interface_type = random.choice(('button', 'toggleswitch', 'handwheel', 'terminal'))
+            x, y = self.__random_coord(random)
+            interfaces.append({
+                'id': config_id,
+                'type': interface_type,
+                'name': '{0} {1}'.format(interface_type, config_id),
+                'description': interface_type,
+                'report': '',
+                'inspectable': False,
+                'enabled': True,
+                'corrupt': False,
+                'x': x,
+                'y': y,
+                'orientation': random.randrange(4),
+                'msg_action_verb': 'use'
+            })
+
+        return interfaces
+
+    def __make_items(self, random, path_coords):
+        """Return tool, part, and artifact configurations placed on path cells."""
+
+        tools = []
+        parts = []
+        artifacts = []
+
+        for i in range(self.item_count):
+            item_kind = random.choice(('tool', 'part', 'artifact'))
+            x, y = random.choice(path_coords)
+            if item_kind == 'tool':
+                item_list, item_type = tools, random.choice(('wrench', 'prybar'))
+            elif item_kind == 'part':
+                item_list, item_type = parts, 'wires'
+            else:
+                item_list, item_type = artifacts, 'generic'
+            item_list.append({
+                'id': len(item_list),
+                'type': item_type,
+                'name': '{0} {1}'.format(item_type, len(item_list)),
+                'description': item_type,
+                'report': '',
+                'inspectable': True,
+                'visible': True,
+                'interactive': True,
+                'blocking': False,
+                'x': x,
+                'y': y
+            })
+
+        return tools, parts, artifacts
+
+    @staticmethod
+    def __make_links(random, interfaces, devices):
+        """Return links from each interface to up to three devices."""
+
+        links = []
+
+        if not devices:
+            return links
+
+        for interface_config in interfaces:
+            link_count = random.randint(1, min(3, len(devices)))
+            for device_config in random.sample(devices, link_count):
+                links.append({'interface_id': interface_config['id'], 'device_id': device_config['id']})
+
+        return links
+
+    @staticmethod
+    def __make_relates(random, devices, properties):
+        """Return relates from devices to random properties."""
+
+        relates = []
+
+        if not properties:
+            return relates
+
+        for device_config in devices:
+            if random.random() < 0.5:
+                property_config = random.choice(properties)
+                relates.append({'device_id': device_config['id'], 'property_id': property_config['id']})
+
+        return relates
+
+    def __make_deaths(self, random, devices, properties):
+        """Return death configurations that are not satisfied when the level starts."""
+
+        deaths = []
+
+        for i in range(self.death_count):
+            device_states = None
+            property_states = None
+            if devices and (not properties or random.random() < 0.5):
+                device_config = random.choice(devices)
+                device_states = [{'device_id': device_config['id'], 'active_state': not device_config['active']}]
+            elif properties:
+                property_config = random.choice(properties)
+                property_states = [{'property_id': property_config['id'],
+                                    'operator': 'gt',
+                                    'value': property_config['max_value']}]
+            deaths.append({
+                'device_states': device_states,
+                'property_states': property_states,
+                'action': None,
+                'location': self.__random_coord(random) if device_states is None and property_states is None else None,
+                'description': 'Generated death {0}.'.format(i)
+            })
+
+        return deaths
+
+
+def register_level_config(number, config):
+    """Add a generated level configuration to level_config under the level number."""
+
+    if number in level_config:
+        raise error.ConfigError("The level number {0} is already configured.".format(number))
+
+    level_config[number] = config
@@ -1,6 +1,7 @@
 import utility
 from level.map import Map
 from level.system import System
+from level.death import DeathIndex
 from level.death import DeathFactory
 from config import level_config
 
@@ -16,6 +17,7 @@ class Level(object):
         self.system = System(self)
         self.map = Map(self)
         self.deaths = []
+        self.death_index = DeathIndex(self)
 
     def build(self):
         """Build the specified level."""
@@ -28,6 +30,24 @@ class Level(object):
         for death_config in level_config[self.number]['deaths']:
             self.deaths.append(DeathFactory.make_from_config(self, death_config))
 
+        self.death_index.build(self.deaths)
+
+    def renew_ids(self):
+        """Give the game objects of the level new ids, so they differ from those of other copies of the level."""
+
+        self.system.renew_ids()
+        self.map.renew_ids()
+
+    def attach(self):
+        """Start following the game events, once this is the level being played."""
+
+        self.death_index.subscribe(self.game.events)
+
+    def detach(self):
+        """Stop following the game events, once this level is no longer played."""
+
+        self.death_index.unsubscribe()
+
     def is_complete(self):
         """Returns True if the player is at the final cell of the level, otherwise False."""
 
@@ -41,11 +61,7 @@ class Level(object):
     def get_death(self):
         """Return the first death config satisfied, otherwise None."""
 
-        for death in self.deaths:
-            if death.scenario_satisfied():
-                return death
-
-        return None
+        return self.death_index.get_death()
 
     def kills_player(self):
         """Return True if the level is in a state that kills the player, otherwise False."""
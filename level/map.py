@@ -1,4 +1,8 @@
 import error
+import event
+import utility
+from collections.abc import Sequence
+from uuid import uuid4
 from gameobject.component import device
 from gameobject.component import interface
 from gameobject.item.tool import Tool
@@ -8,25 +12,85 @@ from gameobject.item.part import PartFactory
 from gameobject.item.artifact import Artifact
 from gameobject.item.artifact import ArtifactFactory
 from inventory.inventory import Inventory
+from level.pathfinding import PathFinder
+from level.spatial import SpatialIndex
+from level.spatial import get_cells_in_sight
 from config import level_config
 
 
+# indexes into the MapCell contents tuple
+INTERFACES, DEVICES, TOOLS, PARTS, ARTIFACTS = range(5)
+
+# shared, immutable contents returned by cells that hold nothing
+EMPTY_CONTENTS = ()
+
+
 class MapCell(object):
     """A single map cell (tile)."""
 
+    __slots__ = ('map', 'x', 'y', 'index', 'neighbors', 'blocked', 'story', 'story_seen', 'visited', 'seen',
+                 '_contents')
+
     def __init__(self, map, x, y):
         self.map = map
         self.x = x
         self.y = y
-        self.interfaces = []
-        self.devices = []
-        self.tools = []
-        self.parts = []
-        self.artifacts = []
+        self.index = y * map.x_dim + x
+        self.neighbors = None  # (<up>, <right>, <down>, <left>) with None at map edges, linked by Map.build
+        self.blocked = False
         self.story = None
         self.story_seen = False
         self.visited = False
         self.seen = False
+        self._contents = None  # (interfaces, devices, tools, parts, artifacts), allocated on first placement
+
+    def __getstate__(self):
+        """Pickle the cell without its neighbors, which would chain through the whole map; get_d4_cells relinks them."""
+
+        return tuple(getattr(self, slot) if slot != 'neighbors' else None for slot in MapCell.__slots__)
+
+    def __setstate__(self, state):
+
+        for slot, value in zip(MapCell.__slots__, state):
+            setattr(self, slot, value)
+
+    def __get_contents(self):
+        """Return the cell contents, allocating them if nothing has been placed in the cell yet."""
+
+        if self._contents is None:
+            self._contents = ([], [], [], [], [])
+
+        return self._contents
+
+    @property
+    def interfaces(self):
+        """Return all interfaces."""
+
+        return self._contents[INTERFACES] if self._contents is not None else EMPTY_CONTENTS
+
+    @property
+    def devices(self):
+        """Return all devices."""
+
+        return self._contents[DEVICES] if self._contents is not None else EMPTY_CONTENTS
+
+    @property
+    def tools(self):
+        """Return all tools."""
+
+        return self._contents[TOOLS] if self._contents is not None else EMPTY_CONTENTS
+
+    @property
+    def parts(self):
+        """Return all parts."""
+
+        return self._contents[PARTS] if self._contents is not None else EMPTY_CONTENTS
+
+    @property
+    def artifacts(self):
+        """Return all artifacts."""
+
+        return self._contents[ARTIFACTS] if self._contents is not None else EMPTY_CONTENTS
 
     @property
     def components(self):
@@ -47,6 +111,22 @@ class MapCell(object):
     def is_blocked(self):
         """Returns True if the cell is blocked, otherwise False."""
 
+        return self.blocked
+
+    def update_blocked(self):
+        """Recompute the blocked state of the cell and update the map passability."""
+
+        blocked = self.__compute_blocked()
+        changed = blocked != self.blocked
+        self.blocked = blocked
+        self.map.update_passable(self)
+
+        if changed:
+            self.map.events.publish(event.CELL_BLOCKED, self)
+
+    def __compute_blocked(self):
+        """Returns True if the contents of the cell block it, otherwise False."""
+
         blocked_by_interface = False
 
         blocked_by_device = any([
@@ -121,7 +201,9 @@ class MapCell(object):
         if interface in self.interfaces:
             raise error.MapError("The interface is already assigned to the map cell.")
 
-        self.interfaces.append(interface)
+        self.__get_contents()[INTERFACES].append(interface)
+        self.map.register(INTERFACES, interface, self.x, self.y)
+        self.map.events.publish(event.CELL_CONTENTS, self, interface)
 
     def remove_interface(self, interface):
         """Removes the interface from the map cell and return it."""
@@ -129,7 +211,11 @@ class MapCell(object):
         if interface not in self.interfaces:
             raise error.MapError("The interface is not assigned to the map cell.")
 
-        return self.interfaces.pop(self.interfaces.index(interface))
+        removed_interface = self.interfaces.pop(self.interfaces.index(interface))
+        self.map.unregister(INTERFACES, removed_interface)
+        self.map.events.publish(event.CELL_CONTENTS, self, removed_interface)
+
+        return removed_interface
 
     def add_device(self, device):
         """Adds an interface to the map cell."""
@@ -137,15 +223,23 @@ class MapCell(object):
         if device in self.devices:
             raise error.MapError("The device is already assigned to the map cell.")
 
-        self.devices.append(device)
+        self.__get_contents()[DEVICES].append(device)
+        self.map.register(DEVICES, device, self.x, self.y)
+        self.update_blocked()
+        self.map.events.publish(event.CELL_CONTENTS, self, device)
 
     def remove_device(self, device):
         """Removes the interface from the map cell and returns it."""
 
-        if device not in self.interfaces:
+        if device not in self.devices:
             raise error.MapError("The device is not assigned to the map cell.")
 
-        return self.devices.pop(self.devices.index(device))
+        removed_device = self.devices.pop(self.devices.index(device))
+        self.map.unregister(DEVICES, removed_device)
+        self.update_blocked()
+        self.map.events.publish(event.CELL_CONTENTS, self, removed_device)
+
+        return removed_device
 
     def remove_component(self, component):
         """Remove the component from the map cell."""
@@ -163,7 +257,10 @@ class MapCell(object):
         if tool in self.tools:
             raise error.MapError("The tool is already assigned to the map cell.")
 
-        self.tools.append(tool)
+        self.__get_contents()[TOOLS].append(tool)
+        self.map.register(TOOLS, tool, self.x, self.y)
+        self.update_blocked()
+        self.map.events.publish(event.CELL_CONTENTS, self, tool)
 
     def remove_tool(self, tool):
         """Removes the interface from the map cell"""
@@ -171,7 +268,12 @@ class MapCell(object):
         if tool not in self.tools:
             raise error.MapError("The tool is not assigned to the map cell.")
 
-        return self.tools.pop(self.tools.index(tool))
+        removed_tool = self.tools.pop(self.tools.index(tool))
+        self.map.unregister(TOOLS, removed_tool)
+        self.update_blocked()
+        self.map.events.publish(event.CELL_CONTENTS, self, removed_tool)
+
+        return removed_tool
 
     def add_part(self, part):
         """Adds a tool to the map cell."""
@@ -179,7 +281,10 @@ class MapCell(object):
         if part in self.parts:
             raise error.MapError("The part is already assigned to the map cell.")
 
-        self.parts.append(part)
+        self.__get_contents()[PARTS].append(part)
+        self.map.register(PARTS, part, self.x, self.y)
+        self.update_blocked()
+        self.map.events.publish(event.CELL_CONTENTS, self, part)
 
     def remove_part(self, part):
         """Removes the interface from the map cell"""
@@ -187,7 +292,12 @@ class MapCell(object):
         if part not in self.parts:
             raise error.MapError("The part is not assigned to the map cell.")
 
-        return self.parts.pop(self.parts.index(part))
+        removed_part = self.parts.pop(self.parts.index(part))
+        self.map.unregister(PARTS, removed_part)
+        self.update_blocked()
+        self.map.events.publish(event.CELL_CONTENTS, self, removed_part)
+
+        return removed_part
 
     def add_artifact(self, artifact):
         """Adds a tool to the map cell."""
@@ -195,7 +305,10 @@ class MapCell(object):
         if artifact in self.artifacts:
             raise error.MapError("The artifact is already assigned to the map cell.")
 
-        self.artifacts.append(artifact)
+        self.__get_contents()[ARTIFACTS].append(artifact)
+        self.map.register(ARTIFACTS, artifact, self.x, self.y)
+        self.update_blocked()
+        self.map.events.publish(event.CELL_CONTENTS, self, artifact)
 
     def remove_artifact(self, artifact):
         """Removes the interface from the map cell"""
@@ -203,7 +316,12 @@ class MapCell(object):
         if artifact not in self.artifacts:
             raise error.MapError("The artifact is not assigned to the map cell.")
 
-        return self.artifacts.pop(self.artifacts.index(artifact))
+        removed_artifact = self.artifacts.pop(self.artifacts.index(artifact))
+        self.map.unregister(ARTIFACTS, removed_artifact)
+        self.update_blocked()
+        self.map.events.publish(event.CELL_CONTENTS, self, removed_artifact)
+
+        return removed_artifact
 
     def remove_item(self, item):
         """Remove the item from the map cell."""
@@ -218,12 +336,201 @@ class MapCell(object):
             raise TypeError("The item must be of type tool, part or artifact.")
 
 
+class EmptyMapCell(object):
+    """Immutable stand-in returned by sparse maps for cells that are off the path and hold nothing."""
+
+    __slots__ = ()
+
+    map = None
+    x = None
+    y = None
+    index = None
+    neighbors = None
+    blocked = False
+    story = None
+    story_seen = False
+    visited = False
+    seen = False
+    interfaces = EMPTY_CONTENTS
+    devices = EMPTY_CONTENTS
+    tools = EMPTY_CONTENTS
+    parts = EMPTY_CONTENTS
+    artifacts = EMPTY_CONTENTS
+    components = EMPTY_CONTENTS
+    items = EMPTY_CONTENTS
+
+    def __reduce__(self):
+        """Unpickle as the shared instance, so identity checks against EMPTY_CELL keep working."""
+
+        return 'EMPTY_CELL'
+
+    def is_on_path(self):
+
+        return False
+
+    def is_blocked(self):
+        """Returns True if the cell is blocked, otherwise False."""
+
+        return False
+
+    def has_interfaces(self):
+        """Return True if the map cell has any interfaces, otherwise False."""
+
+        return False
+
+    def has_devices(self):
+        """Return True if the map cell has any devices, otherwise False."""
+
+        return False
+
+    def has_components(self):
+        """Return True if the map cell has any components, otherwise False."""
+
+        return False
+
+    def has_tools(self):
+        """Return True if the map cell has any tools, otherwise False."""
+
+        return False
+
+    def has_parts(self):
+        """Return True if the map cell has any parts, otherwise False."""
+
+        return False
+
+    def has_artifacts(self):
+        """Return True if the map cell has any tools, otherwise False."""
+
+        return False
+
+    def has_items(self):
+        """Return True if the map cell has any components, otherwise False."""
+
+        return False
+
+    def has_story(self):
+        """Return True if there is story text associated with the cell, otherwise False."""
+
+        return False
+
+
+# shared cell returned by sparse maps wherever no cell has been materialized
+EMPTY_CELL = EmptyMapCell()
+
+
+class SparseCells(dict):
+    """Materialized cells of a sparse map, keyed by flat cell index; missing cells read as EMPTY_CELL."""
+
+    def __missing__(self, index):
+
+        return EMPTY_CELL
+
+
+class SparseCellSequence(Sequence):
+    """Read-only flat view of the cells of a sparse map, reading EMPTY_CELL wherever no cell was materialized."""
+
+    def __init__(self, cells, length):
+        self.__cells = cells
+        self.__length = length
+
+    def __len__(self):
+
+        return self.__length
+
+    def __getitem__(self, index):
+
+        if isinstance(index, slice):
+            return [self.__cells[i] for i in range(*index.indices(self.__length))]
+
+        if index < 0:
+            index += self.__length
+
+        if not 0 <= index < self.__length:
+            raise IndexError("The cell index is out of range.")
+
+        return self.__cells[index]
+
+    def __iter__(self):
+
+        cells = self.__cells
+
+        for index in range(self.__length):
+            yield cells[index]
+
+
+class Neighborhood(object):
+    """Snapshot of the cells above, right, below, and left of a location and their contents."""
+
+    __slots__ = ('x', 'y', 'cells', 'interfaces', 'devices', 'tools', 'parts', 'artifacts')
+
+    def __init__(self, map, x, y):
+        self.x = x
+        self.y = y
+        self.cells = map.get_d4_cells(x, y)
+        self.interfaces = []
+        self.devices = []
+        self.tools = []
+        self.parts = []
+        self.artifacts = []
+
+        for cell in self.cells:
+            if cell is not None:
+                self.interfaces.append(cell.interfaces)
+                self.devices.append(cell.devices)
+                self.tools.append(cell.tools)
+                self.parts.append(cell.parts)
+                self.artifacts.append(cell.artifacts)
+            else:
+                self.interfaces.append(EMPTY_CONTENTS)
+                self.devices.append(EMPTY_CONTENTS)
+                self.tools.append(EMPTY_CONTENTS)
+                self.parts.append(EMPTY_CONTENTS)
+                self.artifacts.append(EMPTY_CONTENTS)
+
+    @property
+    def components(self):
+        """Return the components for each d4 direction."""
+
+        return [i + d for i, d in zip(self.interfaces, self.devices)]
+
+    @property
+    def items(self):
+        """Return the items for each d4 direction."""
+
+        return [t + p + a for t, p, a in zip(self.tools, self.parts, self.artifacts)]
+
+
+class VisibleRegion(Neighborhood):
+    """Snapshot shaped like a Neighborhood of the objects within a radius, grouped by their d4 direction."""
+
+    __slots__ = ('radius',)
+
+    def __init__(self, map, x, y, radius, line_of_sight=False):
+        self.x = x
+        self.y = y
+        self.radius = radius
+        self.cells = map.get_d4_cells(x, y)
+        contents = ([[], [], [], []], [[], [], [], []], [[], [], [], []], [[], [], [], []], [[], [], [], []])
+        visible_coords = map.get_cells_in_sight(x, y, radius) if line_of_sight else None
+
+        for gameobject, ox, oy, category in map.spatial_index.get_objects_in_radius(x, y, radius):
+            # objects under the viewer are not visible, the same as for d4 cells
+            if (ox, oy) == (x, y):
+                continue
+            if visible_coords is not None and (ox, oy) not in visible_coords:
+                continue
+            contents[category][utility.get_d4_direction(x, y, ox, oy)].append(gameobject)
+
+        self.interfaces, self.devices, self.tools, self.parts, self.artifacts = contents
+
+
 class MapPath(object):
     """Path that the player can access."""
 
     def __init__(self, map):
         self.map = map
-        self.cells = []
+        self.cells = []             # [<cell>,...] in the order they were added
+        self.coordinates = set()    # {(x, y),...}
 
     def add_cell(self, cell):
         """Add a map cell to the path."""
@@ -232,6 +539,22 @@ class MapPath(object):
             raise error.MapError("The cell is already in the path.")
 
         self.cells.append(cell)
+        self.coordinates.add((cell.x, cell.y))
+        self.map.update_passable(cell)
+
+    def add_cells(self, cells):
+        """Add multiple map cells to the path."""
+
+        cells = list(cells)
+        coordinates = {(cell.x, cell.y) for cell in cells}
+
+        if len(coordinates) != len(cells) or not self.coordinates.isdisjoint(coordinates):
+            raise error.MapError("The cell is already in the path.")
+
+        self.cells.extend(cells)
+        self.coordinates.update(coordinates)
+        for cell in cells:
+            self.map.update_passable(cell)
 
     def remove_cell(self, cell):
         """Remove a map cell from the path and return it."""
@@ -239,12 +562,16 @@ class MapPath(object):
         if not self.has_cell(cell):
             raise error.MapError("The cell is not in the path.")
 
-        return self.cells.pop(self.cells.index(cell))
+        removed_cell = self.cells.pop(self.cells.index(cell))
+        self.coordinates.discard((cell.x, cell.y))
+        self.map.update_passable(removed_cell)
+
+        return removed_cell
 
     def has_cell(self, cell):
         """True if the cell is part of the path, otherwise False."""
 
-        return cell in self.cells
+        return (cell.x, cell.y) in self.coordinates
 
 
 class Map(object):
@@ -255,23 +582,56 @@ class Map(object):
         self.inventory = Inventory(self)
         self.x_dim = 0
         self.y_dim = 0
-        self.cells = []
-        self.cells_dict = {}  # {0: {0: <cell>, 1: <cell>}, 1: {0: <cell>, 1: <cell>},...}
+        self.sparse = False
+        self._cells = []  # [<cell>,...] flat array indexed by y * x_dim + x, or SparseCells if sparse
+        self.passable = bytearray()  # 1 where the cell is on the path and not blocked, indexed like cells
+        self.registries = ({}, {}, {}, {}, {})  # ordered {<object>: None} per category, indexed like cell contents
         self.path = MapPath(self)
+        self.pathfinder = PathFinder(self)
+        self.spatial_index = SpatialIndex()
         self.enter_cell = None
         self.exit_cell = None
 
+    @property
+    def events(self):
+        """The event bus of the game."""
+
+        return self.level.game.events
+
+    @property
+    def cells(self):
+        """The cells of the map as a flat sequence indexed by y * x_dim + x, with EMPTY_CELL where a sparse map has none."""
+
+        if self.sparse:
+            return SparseCellSequence(self._cells, self.x_dim * self.y_dim)
+
+        return self._cells
+
     def __build_cells(self, x_dim, y_dim):
-        """Build collection of cells based on x and y dimensions."""
+        """Build the flat array of cells based on x and y dimensions."""
+
+        if self.sparse:
+            # cells are materialized as the path and contents are placed
+            self._cells = SparseCells()
+        else:
+            self._cells = [MapCell(self, x, y)
+                          for y in range(y_dim)
+                          for x in range(x_dim)]
+
+        self.passable = bytearray(x_dim * y_dim)
+        self.pathfinder.invalidate()
+        self.spatial_index = SpatialIndex()
+
+    def __materialize_cell(self, x, y):
+        """Return the cell at the provided coordinates, creating it first in a sparse map."""
 
-        for x in range(x_dim):
-            if x not in self.cells_dict:
-                self.cells_dict[x] = {}
-            for y in range(y_dim):
-                if y not in self.cells_dict[x]:
-                    cell = MapCell(self, x, y)
-                    self.cells_dict[x][y] = cell
-                    self.cells.append(cell)
+        cell = self.get_cell(x, y)
+
+        if cell is EMPTY_CELL:
+            cell = MapCell(self, x, y)
+            self._cells[cell.index] = cell
+
+        return cell
 
     def build(self):
         """Build the map from the config for the provided level number."""
@@ -284,25 +644,28 @@ class Map(object):
 
         self.x_dim = map_config['x_dimension']
         self.y_dim = map_config['y_dimension']
+        self.sparse = map_config.get('sparse', False)
         enter_coord = map_config['coord_enter']
         exit_coord = map_config['coord_exit']
 
         self.__build_cells(self.x_dim, self.y_dim)
 
-        self.enter_cell = self.get_cell(*enter_coord)
-        self.exit_cell = self.get_cell(*exit_coord)
+        self.enter_cell = self.__materialize_cell(*enter_coord)
+        self.exit_cell = self.__materialize_cell(*exit_coord)
 
+        path_cells = []
         for path_cell_config in map_config['path_cells']:
-            path_cell = self.get_cell(*path_cell_config['coordinates'])
+            path_cell = self.__materialize_cell(*path_cell_config['coordinates'])
             path_cell.story = path_cell_config['story']
-            self.path.add_cell(path_cell)
+            path_cells.append(path_cell)
+        self.path.add_cells(path_cells)
 
         for system_interface in self.level.system.interfaces:
-            interface_cell = self.get_cell(*system_interface.location)
+            interface_cell = self.__materialize_cell(*system_interface.location)
             interface_cell.add_interface(system_interface)
 
         for system_device in self.level.system.devices:
-            device_cell = self.get_cell(*system_device.location)
+            device_cell = self.__materialize_cell(*system_device.location)
             device_cell.add_device(system_device)
 
         for tool_config in map_config['tools']:
@@ -318,150 +681,188 @@ class Map(object):
             self.inventory.add_item(new_artifact)
 
         for map_tool in self.inventory.get_tools():
-            tool_cell = self.get_cell(*map_tool.location)
+            tool_cell = self.__materialize_cell(*map_tool.location)
             tool_cell.add_tool(map_tool)
 
         for map_part in self.inventory.get_parts():
-            part_cell = self.get_cell(*map_part.location)
+            part_cell = self.__materialize_cell(*map_part.location)
             part_cell.add_part(map_part)
 
         for map_artifact in self.inventory.get_artifacts():
-            artifact_cell = self.get_cell(*map_artifact.location)
+            artifact_cell = self.__materialize_cell(*map_artifact.location)
             artifact_cell.add_artifact(map_artifact)
 
+        self.__link_neighbors()
+
+    def renew_ids(self):
+        """Give every item on the map a new id."""
+
+        for item in self.inventory.items:
+            item.id = str(uuid4()).split('-')[0]
+
+    def __link_neighbors(self):
+        """Store references to the d4 neighbors of every cell, so walking neighbors needs no lookups."""
+
+        cells = self._cells.values() if self.sparse else self._cells
+
+        for cell in cells:
+            cell.neighbors = tuple(self.get_cell(cell.x + dx, cell.y + dy)
+                                   for dx, dy in utility.D4_OFFSETS)
+
     @property
     def interfaces(self):
         """Interfaces from all map cells"""
 
-        return [i for c in self.cells for i in c.interfaces]
+        return list(self.registries[INTERFACES])
 
     @property
     def devices(self):
         """Devices from all map cells"""
 
-        return [d for c in self.cells for d in c.devices]
+        return list(self.registries[DEVICES])
 
     @property
     def components(self):
         """Components from all map cells."""
 
-        return [o for c in self.cells for o in c.components]
+        return self.interfaces + self.devices
 
     @property
     def tools(self):
         """Tools from all map cells"""
 
-        return [t for c in self.cells for t in c.tools]
+        return list(self.registries[TOOLS])
 
     @property
     def parts(self):
         """Parts from all map cells"""
 
-        return [p for c in self.cells for p in c.parts]
+        return list(self.registries[PARTS])
 
     @property
     def artifacts(self):
         """Artifacts from all map cells"""
 
-        return [a for c in self.cells for a in c.artifacts]
+        return list(self.registries[ARTIFACTS])
 
     @property
     def items(self):
         """Items from all map cells."""
 
-        return [i for c in self.cells for i in c.items]
+        return self.tools + self.parts + self.artifacts
+
+    def get_view(self, category):
+        """Return a live, read-only view of the objects of a category (e.g. DEVICES) in all map cells."""
+
+        return self.registries[category].keys()
+
+    def register(self, category, gameobject, x, y):
+        """Add a game object placed in the map cell at x, y to the registry of its category and the spatial index."""
+
+        self.registries[category][gameobject] = None
+        self.spatial_index.add_object(gameobject, x, y, category)
+
+    def unregister(self, category, gameobject):
+        """Remove a game object taken from a map cell from the registry of its category and the spatial index."""
+
+        del self.registries[category][gameobject]
+        self.spatial_index.remove_object(gameobject)
+
+    def get_index(self, x, y):
+        """Return the flat cell array index of the provided coordinates if they are on the map, otherwise None."""
+
+        if 0 <= x < self.x_dim and 0 <= y < self.y_dim:
+            return y * self.x_dim + x
+
+        return None
 
     def get_cell(self, x, y):
         """Return the cell at the provided coordinates if it exists, otherwise None."""
 
-        try:
-            return self.cells_dict[x][y]
-        except KeyError:
-            return None
+        if 0 <= x < self.x_dim and 0 <= y < self.y_dim:
+            return self._cells[y * self.x_dim + x]
+
+        return None
+
+    def update_passable(self, cell):
+        """Update the passability of the cell from its path membership and blocked state."""
+
+        passable = cell.is_on_path() and not cell.blocked
+
+        if self.passable[cell.index] != passable:
+            self.passable[cell.index] = passable
+            self.pathfinder.invalidate()
+
+    def is_passable(self, x, y):
+        """Return True if the cell at the provided coordinates can be entered, otherwise False."""
+
+        if 0 <= x < self.x_dim and 0 <= y < self.y_dim:
+            return self.passable[y * self.x_dim + x] == 1
+
+        return False
 
     def get_d4_cells(self, x, y):
         """Return the cells above, right, below, and left of the provided coordinates."""
 
-        d4_cells = []
-        d4_coords = [(x, y - 1),
-                     (x + 1, y),
-                     (x, y + 1),
-                     (x - 1, y)]
+        cell = self.get_cell(x, y)
+
+        if cell is not None and cell.neighbors is not None:
+            return cell.neighbors
+
+        neighbors = tuple(self.get_cell(x + dx, y + dy) for dx, dy in utility.D4_OFFSETS)
+
+        # cells lose their neighbors when pickled
+        if cell is not None and cell is not EMPTY_CELL:
+            cell.neighbors = neighbors
+
+        return neighbors
 
-        for coord in d4_coords:
-            d4_cells.append(self.get_cell(*coord))
-        return d4_cells
+    def get_neighborhood(self, x, y):
+        """Return a snapshot of the d4 cells around the provided coordinates and their contents."""
+
+        return Neighborhood(self, x, y)
+
+    def get_cells_in_sight(self, x, y, radius):
+        """Return the set of (x, y) coordinates within the radius that are not hidden behind impassable cells."""
+
+        return get_cells_in_sight(x, y, radius, self.is_passable)
+
+    def get_visible_region(self, x, y, radius, line_of_sight=False):
+        """Return a snapshot of the objects within the radius of the provided coordinates, grouped by d4 direction."""
+
+        return VisibleRegion(self, x, y, radius, line_of_sight)
 
     def get_d4_interfaces(self, x, y):
         """Return the interfaces for the d4 cells around the provided coordinates."""
 
-        d4_interfaces = []
-        for cell in self.get_d4_cells(x, y):
-            if isinstance(cell, MapCell):
-                d4_interfaces.append(cell.interfaces)
-            else:
-                d4_interfaces.append([])
-        return d4_interfaces
+        return self.get_neighborhood(x, y).interfaces
 
     def get_d4_devices(self, x, y):
         """Return the devices for the d4 cells around the provided coordinates."""
 
-        d4_devices = []
-        for cell in self.get_d4_cells(x, y):
-
-            if isinstance(cell, MapCell):
-                d4_devices.append(cell.devices)
-            else:
-                d4_devices.append([])
-
-        return d4_devices
+        return self.get_neighborhood(x, y).devices
 
     def get_d4_components(self, x, y):
         """Return the components for the d4 cells around the provided coordinates."""
 
-        d4_interfaces = self.get_d4_interfaces(x, y)
-        d4_devices = self.get_d4_devices(x, y)
-        d4_components = [items[0] + items[1] for items in zip(d4_interfaces, d4_devices)]
-        return d4_components
+        return self.get_neighborhood(x, y).components
 
     def get_d4_tools(self, x, y):
         """Return the tools for the d4 cells around the provided coordinates."""
 
-        d4_tools = []
-        for cell in self.get_d4_cells(x, y):
-            if isinstance(cell, MapCell):
-                d4_tools.append(cell.tools)
-            else:
-                d4_tools.append([])
-        return d4_tools
+        return self.get_neighborhood(x, y).tools
 
     def get_d4_parts(self, x, y):
         """Return the tools for the d4 cells around the provided coordinates."""
 
-        d4_parts = []
-        for cell in self.get_d4_cells(x, y):
-            if isinstance(cell, MapCell):
-                d4_parts.append(cell.parts)
-            else:
-                d4_parts.append([])
-        return d4_parts
+        return self.get_neighborhood(x, y).parts
 
     def get_d4_artifacts(self, x, y):
         """Return the artifacts for the d4 cells around the provided coordinates."""
 
-        d4_artifacts = []
-        for cell in self.get_d4_cells(x, y):
-            if isinstance(cell, MapCell):
-                d4_artifacts.append(cell.artifacts)
-            else:
-                d4_artifacts.append([])
-        return d4_artifacts
+        return self.get_neighborhood(x, y).artifacts
 
     def get_d4_items(self, x, y):
         """Return the items for the d4 cells around the provided coordinates."""
 
-        d4_tools = self.get_d4_tools(x, y)
-        d4_parts = self.get_d4_parts(x, y)
-        d4_artifacts = self.get_d4_artifacts(x, y)
-        d4_items = [items[0] + items[1] for items in zip(d4_tools, d4_parts, d4_artifacts)]
-        return d4_items
+        return self.get_neighborhood(x, y).items
@@ -0,0 +1,120 @@
+import utility
+from array import array
+from collections import deque
+
+
+# distance of cells that cannot reach the target
+UNREACHABLE = -1
+
+
+class PathFinder(object):
+    """Finds shortest routes between the passable cells of a map."""
+
+    def __init__(self, map):
+        self.map = map
+        self.distance_fields = {}  # {<target cell index>: array of distances to target, indexed like map cells}
+
+    def invalidate(self):
+        """Discard cached distance fields after the passability of the map changed."""
+
+        if self.distance_fields:
+            self.distance_fields = {}
+
+    def get_distance_field(self, x, y):
+        """Return the distances from every cell to the cell at x, y, building the field if it isn't cached."""
+
+        target_index = self.map.get_index(x, y)
+
+        if target_index is None:
+            return None
+
+        try:
+            return self.distance_fields[target_index]
+        except KeyError:
+            distance_field = self.__build_distance_field(x, y)
+            self.distance_fields[target_index] = distance_field
+            return distance_field
+
+    def __build_distance_field(self, x, y):
+        """Breadth-first search outward from the cell at x, y over passable cells."""
+
+        x_dim = self.map.x_dim
+        y_dim = self.map.y_dim
+        passable = self.map.passable
+        distance_field = array('i', [UNREACHABLE]) * (x_dim * y_dim)
+
+        if not self.map.is_passable(x, y):
+            return distance_field
+
+        distance_field[y * x_dim + x] = 0
+        queue = deque([(x, y)])
+
+        while queue:
+            cx, cy = queue.popleft()
+            next_distance = distance_field[cy * x_dim + cx] + 1
+            for dx, dy in utility.D4_OFFSETS:
+                nx = cx + dx
+                ny = cy + dy
+                if 0 <= nx < x_dim and 0 <= ny < y_dim:
+                    index = ny * x_dim + nx
+                    if passable[index] and distance_field[index] == UNREACHABLE:
+                        distance_field[index] = next_distance
+                        queue.append((nx, ny))
+
+        return distance_field
+
+    def get_distance(self, x1, y1, x2, y2):
+        """Return the number of moves from x1, y1 to x2, y2, otherwise None if no route exists."""
+
+        route = self.get_route(x1, y1, x2, y2)
+
+        if route is None:
+            return None
+
+        return len(route)
+
+    def get_route(self, x1, y1, x2, y2):
+        """Return the d4 directions of the shortest route from x1, y1 to x2, y2, otherwise None if no route exists."""
+
+        distance_field = self.get_distance_field(x2, y2)
+
+        if distance_field is None or self.map.get_index(x1, y1) is None:
+            return None
+
+        route = []
+        x, y = x1, y1
+
+        while (x, y) != (x2, y2):
+            step = self.__get_next_step(distance_field, x, y)
+            if step is None:
+                return None
+            direction, x, y = step
+            route.append(direction)
+
+        return route
+
+    def __get_next_step(self, distance_field, x, y):
+        """Return the (direction, x, y) of the neighbor closest to the target, otherwise None."""
+
+        best_step = None
+        best_distance = None
+
+        for direction, (dx, dy) in enumerate(utility.D4_OFFSETS):
+            index = self.map.get_index(x + dx, y + dy)
+            if index is None:
+                continue
+            distance = distance_field[index]
+            if distance != UNREACHABLE and (best_distance is None or distance < best_distance):
+                best_step = (direction, x + dx, y + dy)
+                best_distance = distance
+
+        if best_step is None:
+            return None
+
+        # only step toward the target, otherwise the route would loop
+        current_index = self.map.get_index(x, y)
+        current_distance = distance_field[current_index]
+        if current_distance != UNREACHABLE and best_distance >= current_distance:
+            return None
+
+        return best_step
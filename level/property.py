@@ -1,4 +1,5 @@
 import error
+import event
 from uuid import uuid4
 
 
@@ -7,10 +8,14 @@ from uuid import uuid4
 class Property(object):
     """System property that is used by other game objects."""
 
+    # the value is kept here until the property joins a system, then in its slot of the system state
+    _value = 0
+    _state_slot = None
+
     def __init__(self, system, *args, **kwargs):
         self.system = system
         self.id = str(uuid4()).split('-')[0]
-        self.config_id = None
+        self.config_id = kwargs.get('config_id')
         self.name = 'property'
         self.description = 'property'
         self.min_value = 0
@@ -18,7 +23,6 @@ class Property(object):
         self.units = ''
         self.increment = 0
         self.msg_action_verb = 'examine'
-        self._value = 0
         self.__add_to_system()
 
     def __add_to_system(self):
@@ -28,14 +32,26 @@ class Property(object):
 
     @property
     def value(self):
-        return self._value
+        if self._state_slot is None:
+            return self._value
+        if self.system.property_engine.pending:
+            self.system.property_engine.step()
+        return self.system.state.get_value(self._state_slot)
 
     @value.setter
     def value(self, value):
         if not (self.min_value <= value <= self.max_value):
             raise ValueError("Value must be between min_value ({1}) and max_value ({2}).".format(
                     value, self.min_value, self.max_value))
-        self._value = value
+        changed = value != self.value
+
+        if self._state_slot is None:
+            self._value = value
+        else:
+            self.system.state.set_value(self._state_slot, value)
+
+        if changed:
+            self.system.level.game.events.publish(event.PROPERTY_VALUE, self)
 
     def increase(self):
         self.value += self.increment
@@ -81,8 +97,7 @@ class PropertyFactory(object):
     
     def make_from_config(self, system, property_config):
 
-        new_property = self.make_property(system, property_config['type'])
-        new_property.config_id = property_config['id']
+        new_property = self.make_property(system, property_config['type'], config_id=property_config['id'])
         new_property.name = property_config['name']
         new_property.description = property_config['description']
         new_property.min_value = property_config['min_value']
@@ -0,0 +1,158 @@
+import event
+from gameobject.component.device import Sensor
+
+# numpy vectorizes the batched updates where it is installed
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class PropertyEngine(object):
+    """Applies the property changes of toggled devices to the system state in batches.
+
+    Property limits and increments are read when the engine compiles; the engine recompiles after
+    properties or relates change."""
+
+    def __init__(self, system):
+        self.system = system
+        self.compiled = False
+        self.vectorized = numpy is not None
+        self.min_values = []        # property limits and increments, indexed by state slot
+        self.max_values = []
+        self.increments = []
+        self.device_rows = {}       # {<device>: row} for devices that change properties
+        self.row_offsets = [0]      # row r of the incidence matrix holds slots[row_offsets[r]:row_offsets[r + 1]]
+        self.row_slots = []         # property state slots of each incidence row, concatenated
+        self.slot_properties = {}   # {<state slot>: <property>}
+        self.pending = {}           # {<device row>: <net toggles, +1 per activation and -1 per deactivation>}
+
+    def compile(self):
+        """Read the property limits and build the device to property incidence matrix."""
+
+        self.step()
+
+        slot_count = len(self.system.state.values)
+        min_values = [0] * slot_count
+        max_values = [0] * slot_count
+        increments = [0] * slot_count
+
+        self.slot_properties = {}
+
+        for property in self.system.properties:
+            slot = property._state_slot
+            self.slot_properties[slot] = property
+            min_values[slot] = property.min_value
+            max_values[slot] = property.max_value
+            increments[slot] = property.increment
+
+        self.device_rows = {}
+        self.row_offsets = [0]
+        self.row_slots = []
+
+        for device in self.system.devices:
+            # sensors read their properties without changing them
+            if isinstance(device, Sensor):
+                continue
+            slots = [p._state_slot for p in self.system.relates.get_rights(device)]
+            if slots:
+                self.device_rows[device] = len(self.device_rows)
+                self.row_slots.extend(slots)
+                self.row_offsets.append(len(self.row_slots))
+
+        if self.vectorized:
+            self.min_values = numpy.array(min_values, dtype=numpy.float64)
+            self.max_values = numpy.array(max_values, dtype=numpy.float64)
+            self.increments = numpy.array(increments, dtype=numpy.float64)
+            self.row_offsets = numpy.array(self.row_offsets, dtype=numpy.intp)
+            self.row_slots = numpy.array(self.row_slots, dtype=numpy.intp)
+        else:
+            self.min_values = min_values
+            self.max_values = max_values
+            self.increments = increments
+
+        self.compiled = True
+
+    def invalidate(self):
+        """Apply queued changes and drop the compiled arrays after properties or relates changed."""
+
+        self.step()
+        self.compiled = False
+
+    def queue(self, device, direction):
+        """Queue the property change of a device that was activated (direction 1) or deactivated (direction -1)."""
+
+        if not self.compiled:
+            self.compile()
+
+        row = self.device_rows.get(device)
+
+        if row is None:
+            return
+
+        net_direction = self.pending.get(row, 0) + direction
+
+        if net_direction:
+            self.pending[row] = net_direction
+        else:
+            del self.pending[row]
+
+    def step(self):
+        """Apply all queued device changes at once, clamped to the property limits."""
+
+        if not self.pending:
+            return
+
+        pending = self.pending
+        self.pending = {}
+
+        if self.vectorized:
+            changed_slots = self.__step_vectorized(pending)
+        else:
+            changed_slots = self.__step_scalar(pending)
+
+        for slot in changed_slots:
+            self.system.level.game.events.publish(event.PROPERTY_VALUE, self.slot_properties[slot])
+
+    def __step_vectorized(self, pending):
+        """Apply the queued changes with numpy and return the slots whose values changed."""
+
+        rows = numpy.fromiter(pending.keys(), dtype=numpy.intp, count=len(pending))
+        directions = numpy.fromiter(pending.values(), dtype=numpy.float64, count=len(pending))
+        starts = self.row_offsets[rows]
+        lengths = self.row_offsets[rows + 1] - starts
+
+        # expand each pending row of the incidence matrix into its property slots
+        slot_positions = numpy.repeat(starts - numpy.cumsum(lengths) + lengths, lengths) + numpy.arange(lengths.sum())
+        slots = self.row_slots[slot_positions]
+        toggles = numpy.zeros(len(self.increments), dtype=numpy.float64)
+        numpy.add.at(toggles, slots, numpy.repeat(directions, lengths))
+
+        # a view over the state values, updated in place
+        values = numpy.frombuffer(self.system.state.values, dtype=numpy.float64, count=len(self.increments))
+        updated = numpy.clip(values + toggles * self.increments, self.min_values, self.max_values)
+        changed_slots = numpy.flatnonzero(updated != values)
+        values[changed_slots] = updated[changed_slots]
+
+        return changed_slots.tolist()
+
+    def __step_scalar(self, pending):
+        """Apply the queued changes one slot at a time and return the slots whose values changed."""
+
+        values = self.system.state.values
+        toggles = {}
+
+        for row, direction in pending.items():
+            for slot in self.row_slots[self.row_offsets[row]:self.row_offsets[row + 1]]:
+                toggles[slot] = toggles.get(slot, 0) + direction
+
+        changed_slots = []
+
+        for slot, toggle in sorted(toggles.items()):
+            value = values[slot] + toggle * self.increments[slot]
+            value = min(max(value, self.min_values[slot]), self.max_values[slot])
+            if value != values[slot]:
+                values[slot] = value
+                changed_slots.append(slot)
+
+        return changed_slots
@@ -0,0 +1,119 @@
+# multipliers that map octant-local (column, row) offsets onto map (dx, dy) offsets
+OCTANTS = ((1, 0, 0, 1), (0, 1, 1, 0), (0, -1, 1, 0), (-1, 0, 0, 1),
+           (-1, 0, 0, -1), (0, -1, -1, 0), (0, 1, -1, 0), (1, 0, 0, -1))
+
+
+class SpatialIndex(object):
+    """Spatial hash of game object positions in square buckets of cells."""
+
+    def __init__(self, bucket_size=8):
+        self.bucket_size = bucket_size
+        self.buckets = {}      # {(<bucket x>, <bucket y>): {<gameobject>: (x, y, category)}}
+        self.positions = {}    # {<gameobject>: (x, y, category)}
+
+    def __get_bucket_key(self, x, y):
+        """Return the key of the bucket that holds the coordinates."""
+
+        return x // self.bucket_size, y // self.bucket_size
+
+    def has_object(self, gameobject):
+        """Return True if the game object is in the index, otherwise False."""
+
+        return gameobject in self.positions
+
+    def add_object(self, gameobject, x, y, category=None):
+        """Add the game object at the provided coordinates."""
+
+        if gameobject in self.positions:
+            self.remove_object(gameobject)
+
+        position = (x, y, category)
+        self.positions[gameobject] = position
+        self.buckets.setdefault(self.__get_bucket_key(x, y), {})[gameobject] = position
+
+    def remove_object(self, gameobject):
+        """Remove the game object from the index."""
+
+        x, y, category = self.positions.pop(gameobject)
+        bucket_key = self.__get_bucket_key(x, y)
+        bucket = self.buckets[bucket_key]
+        del bucket[gameobject]
+
+        if not bucket:
+            del self.buckets[bucket_key]
+
+    def get_objects_in_radius(self, x, y, radius):
+        """Return (gameobject, x, y, category) for all objects within the euclidean radius of x, y."""
+
+        matches = []
+        radius_squared = radius * radius
+        min_bx, min_by = self.__get_bucket_key(x - radius, y - radius)
+        max_bx, max_by = self.__get_bucket_key(x + radius, y + radius)
+
+        for bx in range(min_bx, max_bx + 1):
+            for by in range(min_by, max_by + 1):
+                bucket = self.buckets.get((bx, by))
+                if bucket is None:
+                    continue
+                for gameobject, (ox, oy, category) in bucket.items():
+                    if (ox - x) ** 2 + (oy - y) ** 2 <= radius_squared:
+                        matches.append((gameobject, ox, oy, category))
+
+        return matches
+
+
+def get_cells_in_sight(x, y, radius, is_transparent):
+    """Return the set of (x, y) coordinates visible from x, y within the radius (recursive shadowcasting).
+
+    Opaque cells are visible themselves but hide the cells behind them."""
+
+    visible = {(x, y)}
+
+    for xx, xy, yx, yy in OCTANTS:
+        cast_light(x, y, 1, 1.0, 0.0, radius, xx, xy, yx, yy, is_transparent, visible)
+
+    return visible
+
+
+def cast_light(cx, cy, row, start, end, radius, xx, xy, yx, yy, is_transparent, visible):
+    """Scan one octant row by row, recursing past the edges of opaque cells."""
+
+    if start < end:
+        return
+
+    radius_squared = radius * radius
+    new_start = start
+
+    for j in range(row, radius + 1):
+        dx = -j - 1
+        dy = -j
+        blocked = False
+
+        while dx <= 0:
+            dx += 1
+            mx = cx + dx * xx + dy * xy
+            my = cy + dx * yx + dy * yy
+            left_slope = (dx - 0.5) / (dy + 0.5)
+            right_slope = (dx + 0.5) / (dy - 0.5)
+
+            if start < right_slope:
+                continue
+            elif end > left_slope:
+                break
+
+            if dx * dx + dy * dy <= radius_squared:
+                visible.add((mx, my))
+
+            if blocked:
+                if not is_transparent(mx, my):
+                    new_start = right_slope
+                    continue
+                blocked = False
+                start = new_start
+            elif not is_transparent(mx, my) and j < radius:
+                blocked = True
+                cast_light(cx, cy, j + 1, start, left_slope, radius, xx, xy, yx, yy, is_transparent, visible)
+                new_start = right_slope
+
+        if blocked:
+            break
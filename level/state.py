@@ -0,0 +1,147 @@
+from array import array
+
+
+class SystemState(object):
+    """Packed device flags and property values of a system, addressed by the slots of its devices and properties.
+
+    Devices and properties read and write their state through their slots, so a snapshot is a copy of
+    four buffers."""
+
+    def __init__(self):
+        self.active = bytearray()       # bit per device slot
+        self.enabled = bytearray()      # bit per device slot
+        self.device_slots = 0           # number of device slots, including free ones
+        self.free_device_slots = []
+        self.values = array('d')        # value per property slot
+        self.integral = bytearray()     # bit per property slot, set while the value was assigned as an int
+        self.free_property_slots = []
+
+    def __eq__(self, other):
+
+        if not isinstance(other, SystemState):
+            return NotImplemented
+
+        return (self.active == other.active and self.enabled == other.enabled and
+                self.values == other.values and self.integral == other.integral)
+
+    def __ne__(self, other):
+
+        result = self.__eq__(other)
+
+        return result if result is NotImplemented else not result
+
+    # the state changes as the game is played, hash snapshots instead
+    __hash__ = None
+
+    @staticmethod
+    def __get_bit(bits, slot):
+
+        return bits[slot >> 3] & (1 << (slot & 7)) != 0
+
+    @staticmethod
+    def __set_bit(bits, slot, value):
+
+        if value:
+            bits[slot >> 3] |= 1 << (slot & 7)
+        else:
+            bits[slot >> 3] &= ~(1 << (slot & 7)) & 0xFF
+
+    def add_device(self, device):
+        """Give the device a slot, initialized from the flags it had before joining the system."""
+
+        if self.free_device_slots:
+            slot = self.free_device_slots.pop()
+        else:
+            slot = self.device_slots
+            self.device_slots += 1
+            if slot >> 3 == len(self.active):
+                self.active.append(0)
+                self.enabled.append(0)
+
+        self.__set_bit(self.active, slot, device._active)
+        self.__set_bit(self.enabled, slot, device._enabled)
+        device._state_slot = slot
+
+    def remove_device(self, device):
+        """Copy the flags back to the device and free its slot."""
+
+        slot = device._state_slot
+        device._active = self.get_active(slot)
+        device._enabled = self.get_enabled(slot)
+        device._state_slot = None
+        self.__set_bit(self.active, slot, False)
+        self.__set_bit(self.enabled, slot, False)
+        self.free_device_slots.append(slot)
+
+    def get_active(self, slot):
+
+        return self.__get_bit(self.active, slot)
+
+    def set_active(self, slot, value):
+
+        self.__set_bit(self.active, slot, value)
+
+    def get_enabled(self, slot):
+
+        return self.__get_bit(self.enabled, slot)
+
+    def set_enabled(self, slot, value):
+
+        self.__set_bit(self.enabled, slot, value)
+
+    def add_property(self, property):
+        """Give the property a slot, initialized from the value it had before joining the system."""
+
+        if self.free_property_slots:
+            slot = self.free_property_slots.pop()
+        else:
+            slot = len(self.values)
+            self.values.append(0.0)
+            if slot >> 3 == len(self.integral):
+                self.integral.append(0)
+
+        property._state_slot = slot
+        self.set_value(slot, property._value)
+
+    def remove_property(self, property):
+        """Copy the value back to the property and free its slot."""
+
+        slot = property._state_slot
+        property._value = self.get_value(slot)
+        property._state_slot = None
+        self.values[slot] = 0.0
+        self.__set_bit(self.integral, slot, False)
+        self.free_property_slots.append(slot)
+
+    def get_value(self, slot):
+
+        value = self.values[slot]
+
+        if self.__get_bit(self.integral, slot) and value.is_integer():
+            return int(value)
+
+        return value
+
+    def set_value(self, slot, value):
+
+        self.values[slot] = value
+        self.__set_bit(self.integral, slot, isinstance(value, int))
+
+    def snapshot(self):
+        """Return an immutable, hashable copy of the state."""
+
+        return (bytes(self.active), bytes(self.enabled), self.values.tobytes(), bytes(self.integral))
+
+    def restore(self, snapshot):
+        """Overwrite the state with a snapshot taken from this state while it had the same slots."""
+
+        active, enabled, values, integral = snapshot
+
+        if (len(active) != len(self.active) or len(values) != len(self.values) * self.values.itemsize):
+            raise ValueError("The snapshot was taken with different device or property slots.")
+
+        self.active[:] = active
+        self.enabled[:] = enabled
+        self.values = array('d')
+        self.values.frombytes(values)
+        self.integral[:] = integral
@@ -1,6 +1,10 @@
 import error
+import event
+from uuid import uuid4
 from level.property import Property
 from level.property import PropertyFactory
+from level.simulation import PropertyEngine
+from level.state import SystemState
 from gameobject.component.device import Device
 from gameobject.component.device import DeviceFactory
 from gameobject.component.interface import Interface
@@ -8,6 +12,306 @@ from gameobject.component.interface import InterfaceFactory
 from config import level_config
 
 
+class Multimap(object):
+    """Many-to-many relation between two kinds of objects, indexed in both directions."""
+
+    def __init__(self):
+        self.forward = {}   # {<left object>: {<right object>: None}}, ordered by insertion
+        self.backward = {}  # {<right object>: {<left object>: None}}, ordered by insertion
+
+    def __len__(self):
+
+        return sum(len(rights) for rights in self.forward.values())
+
+    def __iter__(self):
+        """Yield (left, right) pairs."""
+
+        for left, rights in self.forward.items():
+            for right in rights:
+                yield left, right
+
+    def has(self, left, right):
+        """Return True if the pair is related, otherwise False."""
+
+        return right in self.forward.get(left, ())
+
+    def add(self, left, right):
+        """Relate the pair."""
+
+        self.forward.setdefault(left, {})[right] = None
+        self.backward.setdefault(right, {})[left] = None
+
+    def remove(self, left, right):
+        """Remove the relation between the pair."""
+
+        self.__discard(self.forward, left, right)
+        self.__discard(self.backward, right, left)
+
+    def get_rights(self, left):
+        """Return the objects related to the left object."""
+
+        return list(self.forward.get(left, ()))
+
+    def get_lefts(self, right):
+        """Return the objects related to the right object."""
+
+        return list(self.backward.get(right, ()))
+
+    def remove_left(self, left):
+        """Remove every relation of the left object."""
+
+        for right in self.forward.pop(left, ()):
+            self.__discard(self.backward, right, left)
+
+    def remove_right(self, right):
+        """Remove every relation of the right object."""
+
+        for left in self.backward.pop(right, ()):
+            self.__discard(self.forward, left, right)
+
+    def remove_all(self, lefts=(), rights=()):
+        """Remove every relation of the left and right objects, rebuilding both indexes in one pass each."""
+
+        if not lefts and not rights:
+            return
+
+        self.forward = self.__filter(self.forward, lefts, rights)
+        self.backward = self.__filter(self.backward, rights, lefts)
+
+    @staticmethod
+    def __filter(index, removed_keys, removed_values):
+        """Return a copy of the index without the removed keys and values, keeping the order of the rest."""
+
+        filtered_index = {}
+
+        for key, values in index.items():
+            if key in removed_keys:
+                continue
+            kept_values = {value: None for value in values if value not in removed_values}
+            if kept_values:
+                filtered_index[key] = kept_values
+
+        return filtered_index
+
+    @staticmethod
+    def __discard(index, key, value):
+        """Remove the value from the key's entries, dropping the key once it has none."""
+
+        values = index.get(key)
+
+        if values is not None and value in values:
+            del values[value]
+            if not values:
+                del index[key]
+
+
+class PrefixTrieNode(object):
+    """Node of a PrefixTrie."""
+
+    __slots__ = ('children', 'value', 'count')
+
+    def __init__(self):
+        self.children = {}  # {<character>: <node>}
+        self.value = None   # value of the key that ends at this node
+        self.count = 0      # number of keys at or below this node
+
+
+class PrefixTrie(object):
+    """Character trie mapping string keys to values, for prefix matching and completion."""
+
+    def __init__(self):
+        self.root = PrefixTrieNode()
+
+    def __len__(self):
+
+        return self.root.count
+
+    def __get_node(self, prefix):
+        """Return the node that the prefix ends at, otherwise None."""
+
+        node = self.root
+
+        for character in prefix:
+            node = node.children.get(character)
+            if node is None:
+                return None
+
+        return node
+
+    def add(self, key, value):
+        """Add the key with its value, replacing the value if the key exists."""
+
+        existing_node = self.__get_node(key)
+
+        if existing_node is not None and existing_node.value is not None:
+            existing_node.value = value
+            return
+
+        node = self.root
+        node.count += 1
+
+        for character in key:
+            node = node.children.setdefault(character, PrefixTrieNode())
+            node.count += 1
+
+        node.value = value
+
+    def remove(self, key):
+        """Remove the key and return its value."""
+
+        value = self.get(key)
+
+        if value is None:
+            raise KeyError(key)
+
+        node = self.root
+        node.count -= 1
+
+        for character in key:
+            child = node.children[character]
+            child.count -= 1
+            if child.count == 0:
+                # nothing else shares the rest of the key
+                del node.children[character]
+                return value
+            node = child
+
+        node.value = None
+
+        return value
+
+    def get(self, key):
+        """Return the value of the exact key, otherwise None."""
+
+        node = self.__get_node(key)
+
+        return node.value if node is not None else None
+
+    def count(self, prefix):
+        """Return the number of keys that start with the prefix."""
+
+        node = self.__get_node(prefix)
+
+        return node.count if node is not None else 0
+
+    def resolve(self, prefix):
+        """Return the value of the only key that starts with the prefix, otherwise None."""
+
+        node = self.__get_node(prefix)
+
+        if node is None or node.count != 1:
+            return None
+
+        while node.value is None:
+            node = next(iter(node.children.values()))
+
+        return node.value
+
+    def get_values(self, prefix):
+        """Return the values of all keys that start with the prefix, ordered by key."""
+
+        node = self.__get_node(prefix)
+
+        if node is None:
+            return []
+
+        values = []
+        stack = [node]
+
+        while stack:
+            node = stack.pop()
+            if node.value is not None:
+                values.append(node.value)
+            stack.extend(node.children[character] for character in sorted(node.children, reverse=True))
+
+        return values
+
+
+class SystemTransaction(object):
+    """Device state changes that a System applies together, usable as a context manager that commits on exit."""
+
+    def __init__(self, system):
+        self.system = system
+        self.changes = {}   # {<device>: <final active state>}, ordered by first change
+
+    def __enter__(self):
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+
+        if exc_type is None:
+            self.commit()
+
+    def set_active(self, device, active):
+        """Set the final active state of the device."""
+
+        if not self.system.has_device(device):
+            raise error.SystemError("The device is not in the system.")
+
+        self.changes[device] = active
+
+    def activate(self, device):
+        """Activate the device when the transaction commits."""
+
+        self.set_active(device, True)
+
+    def deactivate(self, device):
+        """Deactivate the device when the transaction commits."""
+
+        self.set_active(device, False)
+
+    def get_final_active(self, device):
+        """Return the active state the device will have after the transaction commits."""
+
+        return self.changes.get(device, device.active)
+
+    def validate(self, changed_devices):
+        """Raise a SystemError if a changed device is disabled or its dependencies are unmet in the final state."""
+
+        for device in changed_devices:
+            if device.enabled is False:
+                raise error.SystemError("The device {0} is disabled.".format(device.id))
+            if device.override_dependencies is True:
+                continue
+            for dependency_device, enabled_state, active_state in self.system.dependency_graph.get(device, ()):
+                if (dependency_device.enabled != enabled_state or
+                        self.get_final_active(dependency_device) != active_state):
+                    raise error.SystemError("The device {0} has unmet dependencies.".format(device.id))
+
+    def commit(self):
+        """Apply all changes or none of them and return the devices whose state changed."""
+
+        system = self.system
+
+        if system.committing is not None:
+            raise error.SystemError("Another transaction is being committed.")
+
+        changed_devices = [device for device, active in self.changes.items() if device.active != active]
+        self.validate(changed_devices)
+
+        system.committing = self
+        try:
+            for device in changed_devices:
+                device.active = self.changes[device]
+        finally:
+            system.committing = None
+
+        dependent_devices = {}
+        for device in changed_devices:
+            for dependent_device in system.dependency_links.get_rights(device):
+                dependent_devices[dependent_device] = None
+        for dependent_device in dependent_devices:
+            dependent_device.update_operable()
+
+        self.changes = {}
+
+        if changed_devices:
+            system.level.game.events.publish(event.SYSTEM_CHANGE, system, changed_devices)
+
+        return changed_devices
+
+
 class System(object):
     """A collection of interfaces and devices the player can control."""
 
@@ -16,8 +320,20 @@ class System(object):
         self.interfaces = []    # [<interface>,...]
         self.devices = []       # [<device>,...]
         self.properties = []    # [<property>,...]
-        self.links = []         # [{'interface_id': <device id>},...]
-        self.relates = []       # [{'device_id': <property_id>},...]
+        self.links = Multimap()     # <interface> <-> <device>
+        self.relates = Multimap()   # <device> <-> <property>
+        self.interface_index = {}           # {<interface id>: <interface>}
+        self.interface_config_index = {}    # {<interface config id>: <interface>}
+        self.device_index = {}              # {<device id>: <device>}
+        self.device_config_index = {}       # {<device config id>: <device>}
+        self.property_index = {}            # {<property id>: <property>}
+        self.property_config_index = {}     # {<property config id>: <property>}
+        self.device_trie = PrefixTrie()     # device ids for prefix lookups
+        self.dependency_graph = {}          # {<device>: [(<dependency device>, <enabled state>, <active state>),...]}
+        self.dependency_links = Multimap()  # <dependency device> <-> <dependent device>
+        self.state = SystemState()          # device flags and property values, addressed by slot
+        self.property_engine = PropertyEngine(self)
+        self.committing = None              # transaction whose changes are being applied
 
     def build(self):
         """Build system from config dictionary."""
@@ -46,6 +362,8 @@ class System(object):
                     dependency_config['enabled_state'],
                     dependency_config['active_state'])
 
+        self.check_dependency_cycles()
+
         for link_config in system_config['links']:
             link_interface = self.get_interface(config_id=link_config['interface_id'])
             link_device = self.get_device(config_id=link_config['device_id'])
@@ -56,78 +374,65 @@ class System(object):
             relate_property = self.get_property(config_id=relate_config['property_id'])
             self.relate_property(relate_device, relate_property)
 
+        self.property_engine.compile()
+
     def has_interface(self, interface):
         """Returns True if the system contains the interface, otherwise False."""
 
-        return interface in self.interfaces
+        return self.interface_index.get(getattr(interface, 'id', None)) is interface
 
     def has_device(self, device):
         """Returns True if the system contains the device, otherwise False."""
 
-        return device in self.devices
+        return self.device_index.get(getattr(device, 'id', None)) is device
 
     def has_property(self, property):
         """Returns True if the system contains the property, otherwise False."""
 
-        return property in self.properties
+        return self.property_index.get(getattr(property, 'id', None)) is property
 
     def get_interface(self, interface_id=None, config_id=None):
         """Return the interface if it exists."""
 
-        interface = None
-
         if interface_id is not None:
-            for check_interface in self.interfaces:
-                if check_interface.id == interface_id:
-                    interface = check_interface
-                    break
+            return self.interface_index.get(interface_id)
 
         elif config_id is not None:
-            for check_interface in self.interfaces:
-                if check_interface.config_id == config_id:
-                    interface = check_interface
-                    break
-
-        return interface
+            return self.interface_config_index.get(config_id)
 
     def get_device(self, device_id=None, config_id=None):
         """Return the device if it exists."""
 
         if device_id is not None:
-            for check_device in self.devices:
-                if check_device.id == device_id:
-                    return check_device
+            return self.device_index.get(device_id)
 
         elif config_id is not None:
-            for check_device in self.devices:
-                if check_device.config_id == config_id:
-                    return check_device
+            return self.device_config_index.get(config_id)
 
     def get_devices(self, device_id=None):
-        """Return devices matched by device id."""
+        """Return devices whose id starts with the device id, ordered by id."""
 
         if device_id is not None:
-            device_matches = [dev for dev in self.devices if device_id == dev.id[:len(device_id)]]
-            return device_matches
+            return self.device_trie.get_values(device_id)
+
+    def resolve_device(self, device_id):
+        """Return the only device whose id starts with the device id, otherwise None."""
+
+        return self.device_trie.resolve(device_id)
+
+    def count_devices(self, device_id):
+        """Return the number of devices whose id starts with the device id."""
+
+        return self.device_trie.count(device_id)
 
     def get_property(self, property_id=None, config_id=None):
         """Return the property if it exists."""
 
-        property = None
-
         if property_id is not None:
-            for check_property in self.properties:
-                if check_property.id == property_id:
-                    property = check_property
-                    break
+            return self.property_index.get(property_id)
 
         elif config_id is not None:
-            for check_property in self.properties:
-                if check_property.config_id == config_id:
-                    property = check_property
-                    break
-
-        return property
+            return self.property_config_index.get(config_id)
 
     def get_interface_ids(self, device):
         """Return list of interface ids related to device."""
@@ -138,44 +443,18 @@ class System(object):
         if not self.has_device(device):
             raise error.SystemError("The device is not a component of the system.")
 
-        interface_ids = []
-
-        for link in self.links:
-            if link['device_id'] == device.id:
-                interface_ids.append(link['interface_id'])
-
-        return interface_ids
+        return [interface.id for interface in self.links.get_lefts(device)]
 
     def get_device_ids(self, interface=None, property=None):
         """Return list of device ids linked to interface or related to property."""
 
-        device_ids = []
-
         if interface is not None:
-
-            if not isinstance(interface, Interface):
-                raise TypeError("Object not of type 'Interface'.")
-
-            if not self.has_interface(interface):
-                raise error.SystemError("The interface is not in the system.")
-
-            for link in self.links:
-                if link['interface_id'] == interface.id:
-                    device_ids.append(link['device_id'])
+            return [device.id for device in self.get_interface_devices(interface)]
 
         elif property is not None:
+            return [device.id for device in self.get_property_devices(property)]
 
-            if not isinstance(property, Property):
-                raise TypeError("Object not of type 'Property'.")
-
-            if not self.has_property(property):
-                raise error.SystemError("The property is not in the system.")
-
-            for relate in self.relates:
-                if relate['property_id'] == property.id:
-                    device_ids.append(relate['device_id'])
-
-        return device_ids
+        return []
 
     def get_property_ids(self, device):
         """Return list of property ids related to device."""
@@ -186,49 +465,116 @@ class System(object):
         if not self.has_device(device):
             raise error.SystemError("The device is not in the system.")
 
-        property_ids = []
-
-        for relate in self.relates:
-            if relate['device_id'] == device.id:
-                property_ids.append(relate['property_id'])
-
-        return property_ids
+        return [property.id for property in self.relates.get_rights(device)]
 
     def get_interface_devices(self, interface):
         """Return a list of all devices linked to an interface."""
 
-        device_ids = self.get_device_ids(interface=interface)
-        interface_devices = [device for device in self.devices
-                             if device.id in device_ids]
+        if not isinstance(interface, Interface):
+            raise TypeError("Object not of type 'Interface'.")
+
+        if not self.has_interface(interface):
+            raise error.SystemError("The interface is not in the system.")
 
-        return interface_devices
+        return self.links.get_rights(interface)
 
     def get_device_interfaces(self, device):
         """Return a list of all interfaces linked to a device."""
 
-        interface_ids = self.get_interface_ids(device)
-        device_interfaces = [interface for interface in self.interfaces
-                             if interface.id in interface_ids]
+        if not isinstance(device, Device):
+            raise TypeError("Object not of type 'Device'.")
 
-        return device_interfaces
+        if not self.has_device(device):
+            raise error.SystemError("The device is not a component of the system.")
+
+        return self.links.get_lefts(device)
 
     def get_device_properties(self, device):
         """Return a list of all properties related to a device."""
 
-        property_ids = self.get_property_ids(device)
-        device_properties = [property for property in self.properties
-                             if property.id in property_ids]
+        if not isinstance(device, Device):
+            raise TypeError("Object not of type 'Device'.")
 
-        return device_properties
+        if not self.has_device(device):
+            raise error.SystemError("The device is not in the system.")
+
+        return self.relates.get_rights(device)
 
     def get_property_devices(self, property):
         """Return a list of all devices related to a property."""
 
-        device_ids = self.get_device_ids(property=property)
-        property_devices = [device for device in self.devices
-                            if device.id in device_ids]
+        if not isinstance(property, Property):
+            raise TypeError("Object not of type 'Property'.")
 
-        return property_devices
+        if not self.has_property(property):
+            raise error.SystemError("The property is not in the system.")
+
+        return self.relates.get_lefts(property)
+
+    def compile_dependencies(self, device):
+        """Resolve the dependencies of the device into the dependency graph and update its operable state."""
+
+        self.dependency_links.remove_right(device)
+        compiled_dependencies = []
+
+        for dependency in device.dependencies:
+            dependency_device = self.get_device(dependency['device_id'])
+            if dependency_device is None:
+                raise error.SystemError("The specified device is not in the system.")
+            compiled_dependencies.append(
+                (dependency_device, dependency['enabled_state'], dependency['active_state']))
+            self.dependency_links.add(dependency_device, device)
+
+        if compiled_dependencies:
+            self.dependency_graph[device] = compiled_dependencies
+        else:
+            self.dependency_graph.pop(device, None)
+
+        device.update_operable()
+
+    def check_dependency_cycles(self):
+        """Raise a SystemError if any device depends on itself through its dependencies."""
+
+        # 1 while the device is on the search path, 2 once all of its dependencies are checked
+        states = {}
+
+        for start_device in self.dependency_graph:
+            if start_device in states:
+                continue
+            path = [start_device]
+            pending = [iter(self.dependency_graph[start_device])]
+            states[start_device] = 1
+            while pending:
+                dependency = next(pending[-1], None)
+                if dependency is None:
+                    states[path.pop()] = 2
+                    pending.pop()
+                    continue
+                dependency_device = dependency[0]
+                state = states.get(dependency_device)
+                if state == 1:
+                    cycle = path[path.index(dependency_device):] + [dependency_device]
+                    raise error.SystemError("The device dependencies form a cycle: {0}.".format(
+                        ' -> '.join(d.id for d in cycle)))
+                if state is None:
+                    states[dependency_device] = 1
+                    path.append(dependency_device)
+                    pending.append(iter(self.dependency_graph.get(dependency_device, ())))
+
+    def are_dependencies_met(self, device):
+        """Return True if every compiled dependency of the device is in its required state, otherwise False."""
+
+        for dependency_device, enabled_state, active_state in self.dependency_graph.get(device, ()):
+            if dependency_device.enabled != enabled_state or dependency_device.active != active_state:
+                return False
+
+        return True
+
+    def update_dependents(self, device):
+        """Update the operable state of the devices that depend on the device after its state changed."""
+
+        for dependent_device in self.dependency_links.get_rights(device):
+            dependent_device.update_operable()
 
     def get_components(self):
         """Return all components."""
@@ -238,94 +584,258 @@ class System(object):
     def add_interface(self, interface):
         """Add an interface to the system."""
 
-        if interface in self.interfaces:
+        if self.has_interface(interface):
             raise error.SystemError("The interface is already in the system.")
 
         self.interfaces.append(interface)
+        self.interface_index[interface.id] = interface
+
+        if interface.config_id is not None:
+            self.interface_config_index[interface.config_id] = interface
 
     def remove_interface(self, interface):
         """Remove an interface from the system and return it."""
 
-        if interface not in self.interfaces:
+        if not self.has_interface(interface):
             raise error.SystemError("The interface is not in the system.")
 
-        for link in self.links:
-            if link['interface_id'] == interface.id:
-                self.links.remove(link)
+        self.links.remove_left(interface)
+
+        del self.interface_index[interface.id]
+
+        if self.interface_config_index.get(interface.config_id) is interface:
+            del self.interface_config_index[interface.config_id]
 
         return self.interfaces.pop(self.interfaces.index(interface))
 
     def add_device(self, device):
         """Add a device to the system."""
 
-        if device in self.devices:
+        if self.has_device(device):
             raise error.SystemError("The device is already in the system.")
 
         self.devices.append(device)
+        self.state.add_device(device)
+        self.device_index[device.id] = device
+        self.device_trie.add(device.id, device)
+
+        if device.config_id is not None:
+            self.device_config_index[device.config_id] = device
 
     def remove_device(self, device):
         """Remove a device from the system and return it."""
 
-        if device not in self.devices:
+        if not self.has_device(device):
             raise error.SystemError("The device is not in the system.")
 
-        for link in self.links:
-            if link['device_id'] == device.id:
-                self.links.remove(link)
+        self.links.remove_right(device)
+        self.relates.remove_left(device)
+
+        # devices can't depend on a device that left the system
+        for dependent_device in self.dependency_links.get_rights(device):
+            dependent_device.remove_dependency(device.id)
+
+        self.dependency_links.remove_right(device)
+        self.dependency_graph.pop(device, None)
+        self.property_engine.invalidate()
+
+        del self.device_index[device.id]
+        self.device_trie.remove(device.id)
+        self.state.remove_device(device)
+
+        if self.device_config_index.get(device.config_id) is device:
+            del self.device_config_index[device.config_id]
 
         return self.devices.pop(self.devices.index(device))
 
+    def detach_components(self, interfaces=(), devices=(), properties=()):
+        """Remove every link and relate of the interfaces, devices, and properties in a single pass."""
+
+        interfaces = set(interfaces)
+        devices = set(devices)
+        properties = set(properties)
+
+        self.links.remove_all(lefts=interfaces, rights=devices)
+        self.relates.remove_all(lefts=devices, rights=properties)
+
+        if devices or properties:
+            self.property_engine.invalidate()
+
+    def remove_components(self, interfaces=(), devices=(), properties=()):
+        """Remove many interfaces, devices, and properties from the system and return them.
+
+        Nothing is removed unless every object is in the system."""
+
+        interfaces = list(dict.fromkeys(interfaces))
+        devices = list(dict.fromkeys(devices))
+        properties = list(dict.fromkeys(properties))
+
+        if not all(self.has_interface(interface) for interface in interfaces):
+            raise error.SystemError("The interface is not in the system.")
+
+        if not all(self.has_device(device) for device in devices):
+            raise error.SystemError("The device is not in the system.")
+
+        if not all(self.has_property(property) for property in properties):
+            raise error.SystemError("The property is not in the system.")
+
+        removed_interfaces = set(interfaces)
+        removed_devices = set(devices)
+        removed_properties = set(properties)
+
+        self.detach_components(removed_interfaces, removed_devices, removed_properties)
+
+        if removed_devices:
+            # devices that stay can't depend on a device that left the system
+            removed_ids = {device.id for device in removed_devices}
+            dependent_devices = {dependent_device
+                                 for device in removed_devices
+                                 for dependent_device in self.dependency_links.get_rights(device)
+                                 if dependent_device not in removed_devices}
+            for dependent_device in dependent_devices:
+                dependent_device.dependencies = [d for d in dependent_device.dependencies
+                                                 if d['device_id'] not in removed_ids]
+            self.dependency_links.remove_all(lefts=removed_devices, rights=removed_devices)
+            for device in removed_devices:
+                self.dependency_graph.pop(device, None)
+            for dependent_device in dependent_devices:
+                self.compile_dependencies(dependent_device)
+
+        for interface in interfaces:
+            del self.interface_index[interface.id]
+            if self.interface_config_index.get(interface.config_id) is interface:
+                del self.interface_config_index[interface.config_id]
+
+        for device in devices:
+            del self.device_index[device.id]
+            self.device_trie.remove(device.id)
+            self.state.remove_device(device)
+            if self.device_config_index.get(device.config_id) is device:
+                del self.device_config_index[device.config_id]
+
+        for property in properties:
+            del self.property_index[property.id]
+            self.state.remove_property(property)
+            if self.property_config_index.get(property.config_id) is property:
+                del self.property_config_index[property.config_id]
+
+        if removed_interfaces:
+            self.interfaces = [i for i in self.interfaces if i not in removed_interfaces]
+
+        if removed_devices:
+            self.devices = [d for d in self.devices if d not in removed_devices]
+
+        if removed_properties:
+            self.properties = [p for p in self.properties if p not in removed_properties]
+
+        return interfaces + devices + properties
+
     def add_property(self, property):
         """Add a property to the system."""
 
-        if property in self.properties:
+        if self.has_property(property):
             raise error.SystemError("The property is already in the system.")
 
+        self.property_engine.invalidate()
+
         self.properties.append(property)
+        self.state.add_property(property)
+        self.property_index[property.id] = property
+
+        if property.config_id is not None:
+            self.property_config_index[property.config_id] = property
 
     def remove_property(self, property):
         """Remove a property from the system and return it."""
 
-        if property not in self.properties:
+        if not self.has_property(property):
             raise error.SystemError("The property is not in the system.")
 
-        for relate in self.relates:
-            if relate['property_id'] == property.id:
-                self.relates.remove(property)
+        self.property_engine.invalidate()
+        self.relates.remove_right(property)
+
+        del self.property_index[property.id]
+        self.state.remove_property(property)
+
+        if self.property_config_index.get(property.config_id) is property:
+            del self.property_config_index[property.config_id]
 
         return self.properties.pop(self.properties.index(property))
 
     def link_device(self, interface, device):
         """Link an interface to a device."""
 
-        if interface not in self.interfaces:
+        if not self.has_interface(interface):
             raise error.SystemError("The interface is not in the system.")
 
-        if device not in self.devices:
+        if not self.has_device(device):
             raise error.SystemError("The device is not in the system.")
 
-        link = {'interface_id': interface.id, 'device_id': device.id}
-
-        if link in self.links:
+        if self.links.has(interface, device):
             raise error.SystemError("The link already exists in the system.")
 
-        self.links.append(link)
+        self.links.add(interface, device)
 
     def relate_property(self, device, property):
         """Relate a device to a property."""
 
-        if device not in self.devices:
+        if not self.has_device(device):
             raise error.SystemError("The device is not in the system.")
 
-        if property not in self.properties:
+        if not self.has_property(property):
             raise error.SystemError("The property is not in the system.")
 
-        relate = {'device_id': device.id, 'property_id': property.id}
-
-        if relate in self.relates:
+        if self.relates.has(device, property):
             raise error.SystemError("The relate already exists in the system.")
 
-        self.relates.append(relate)
+        self.relates.add(device, property)
+        self.property_engine.invalidate()
+
+    def renew_ids(self):
+        """Give every component a new id and rebuild the id indexes and the device dependencies that use ids."""
+
+        renewed_ids = {}
+
+        for component in self.interfaces + self.devices + self.properties:
+            renewed_id = str(uuid4()).split('-')[0]
+            renewed_ids[component.id] = renewed_id
+            component.id = renewed_id
+
+        for device in self.devices:
+            for dependency in device.dependencies:
+                dependency['device_id'] = renewed_ids.get(dependency['device_id'], dependency['device_id'])
+
+        self.interface_index = {interface.id: interface for interface in self.interfaces}
+        self.device_index = {device.id: device for device in self.devices}
+        self.property_index = {property.id: property for property in self.properties}
+        self.device_trie = PrefixTrie()
+
+        for device in self.devices:
+            self.device_trie.add(device.id, device)
+
+    def snapshot_state(self):
+        """Return a hashable snapshot of all device flags and property values."""
+
+        self.property_engine.step()
+
+        return self.state.snapshot()
+
+    def restore_state(self, snapshot):
+        """Restore device flags and property values from a snapshot and refresh the state derived from them."""
+
+        self.property_engine.pending = {}
+        self.state.restore(snapshot)
+
+        for device in self.devices:
+            device.update_operable()
+            device.update_map_cell()
+
+        self.level.game.events.publish(event.SYSTEM_CHANGE, self, list(self.devices))
+
+    def begin_transaction(self):
+        """Return a new transaction for applying device state changes together."""
+
+        return SystemTransaction(self)
 
     def activate_device(self, device):
         """Activate an inactive device."""
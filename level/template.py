@@ -0,0 +1,79 @@
+import io
+import pickle
+from level.level import Level
+from config import level_config
+
+
+class LevelPickler(pickle.Pickler):
+    """Pickles a level, leaving out the game it belongs to and the player."""
+
+    def __init__(self, file, game):
+        super(LevelPickler, self).__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.game = game
+
+    def persistent_id(self, obj):
+
+        if obj is self.game:
+            return 'game'
+        if obj is self.game.player:
+            return 'player'
+
+        return None
+
+
+class LevelUnpickler(pickle.Unpickler):
+    """Unpickles a level into the game it will belong to, with the player of that game."""
+
+    def __init__(self, file, game):
+        super(LevelUnpickler, self).__init__(file)
+        self.game = game
+
+    def persistent_load(self, pid):
+
+        if pid == 'game':
+            return self.game
+        if pid == 'player':
+            return self.game.player
+
+        raise pickle.UnpicklingError("Unknown persistent id {0}.".format(pid))
+
+
+class LevelTemplate(object):
+    """A level built once from its config and frozen, from which live levels are cloned."""
+
+    def __init__(self, game, number):
+        self.number = number
+        self.config = level_config[number]
+
+        level = Level(game, number)
+        level.build()
+
+        buffer = io.BytesIO()
+        LevelPickler(buffer, game).dump(level)
+        self.data = buffer.getvalue()  # immutable, every clone gets its own copy of the mutable state
+
+    def make_level(self, game):
+        """Return a new level for the game with the state the level config starts in."""
+
+        level = LevelUnpickler(io.BytesIO(self.data), game).load()
+
+        # items taken from a restarted level stay with the player, so copies need their own ids
+        level.renew_ids()
+
+        return level
+
+
+# {<level number>: <level template>}
+level_templates = {}
+
+
+def get_level_template(game, number):
+    """Return the template for the level number, compiling it the first time or after its config was replaced."""
+
+    template = level_templates.get(number)
+
+    if template is None or template.config is not level_config[number]:
+        template = LevelTemplate(game, number)
+        level_templates[number] = template
+
+    return template
@@ -11,6 +11,9 @@ from config import level_config
 DEFAULT_ARTICLE = game_config['ui']['articles']['default']
 ARTICLE_MAP = game_config['ui']['articles']['mapped']
 
+# (dx, dy) offsets in d4 direction order: up, right, down, left
+D4_OFFSETS = ((0, -1), (1, 0), (0, 1), (-1, 0))
+
 
 def get_os():
     """Returns base operating system name."""
@@ -87,6 +90,20 @@ def get_direction(x1, y1, x2, y2):
         return 1 if dx == 1 else 3
 
 
+def get_d4_direction(x1, y1, x2, y2):
+    """Return the d4 direction nearest to the bearing from location 1 (x1, y1) to location 2 (x2, y2).
+
+    Diagonal bearings resolve to the vertical direction."""
+
+    dx = x2 - x1
+    dy = y2 - y1
+
+    if abs(dy) >= abs(dx):
+        return 2 if dy > 0 else 0
+    else:
+        return 1 if dx > 0 else 3
+
+
 def get_relative_direction_text(orientation, direction):
     """Returns the text description of the direction based on orientation."""
 